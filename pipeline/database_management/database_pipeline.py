@@ -136,7 +136,7 @@ class DataBasePipeline:
             return table_exist
 
         except Exception as e:
-            self.logger.error(f"❌ Erreur lors de la vérification de la table '{query_params["table"]}' → {e}")
+            self.logger.error(f"❌ Erreur lors de la vérification de la table '{query_params['table']}' → {e}")
             return False
 
     def execute_sql_file(self, conn, sql_file: Path):
@@ -205,8 +205,7 @@ class DataBasePipeline:
             # Création de la table historique
             if not self.is_table_exist(conn, query_params_histo):
                 self.copy_table_into_new(conn, table_name, table_name_histo)
-            
-            elif self.is_table_exist(conn, query_params_histo):
+            else:
                 self.append_table(conn, table_name, table_name_histo) 
 
             # Ajout de la date du jour dans la table historique  
@@ -217,6 +216,21 @@ class DataBasePipeline:
             self.logger.error(f"❌ Erreur lors de l'historisation : {e}")
             raise
 
+    def historise_tables(self, conn, tables: list):
+        """
+        Historise les données de plusieurs tables, l'une après l'autre (historise_table).
+        Peut être surchargée par la classe enfant pour regrouper des étapes communes aux tables.
+
+        Parameters
+        ----------
+        conn : sqlalchemy.engine.base.Connection | duckdb.DuckDBPyConnection
+            Connexion à la base de données.
+        tables : list
+            Noms des tables à historiser.
+        """
+        for table_name in tables:
+            self.historise_table(conn, {"schema": self.schema, "table": table_name})
+
     def import_csv(self, views_to_import: dict):
         """
         Importe les vues vers un format csv.
@@ -229,7 +243,7 @@ class DataBasePipeline:
         conn = self.conn
         for table_name, csv_name in views_to_import.items():
             if table_name:
-                transfo = TableInCsv(conn, table_name, csv_name, self.fetch_df, self.csv_folder_input, self.logger)
+                transfo = TableInCsv(conn, table_name, csv_name, self.export_table_to_csv, self.csv_folder_input, self.logger)
                 transfo.import_to_csv()
             else:
                 self.logger.warning("⚠️ Aucune table spécifiée")
@@ -249,36 +263,122 @@ class DataBasePipeline:
             self.logger.warning("⚠️ Aucun mapping de vues à exporter (views_to_export est vide ou None)")
             return
 
-        conn = self.conn
+        views = []
         for table_name, csv_name in views_to_export.items():
             if table_name:
-                transfo = TableInCsv(conn, table_name, csv_name, self.fetch_df, self.csv_folder_output, self.logger)
-                transfo.export_to_csv(date=date)
+                views.append((table_name, csv_name))
             else:
                 self.logger.warning("⚠️ Aucune table spécifiée")
+        self.export_views(self.conn, views, date)
 
-    def run(self):
+    def export_views(self, conn, views: list, date: str):
+        """
+        Exporte une liste de vues au format csv, l'une après l'autre.
+        Peut être surchargée par la classe enfant pour paralléliser les exports.
+
+        Parameters
+        ----------
+        conn : sqlalchemy.engine.base.Connection | duckdb.DuckDBPyConnection
+            Connexion à la base de données.
+        views : list
+            Couples (nom de la vue, nom du fichier csv) à exporter.
+        date : str
+            Date présente dans le nom des fichiers à exporter.
+        """
+        for table_name, csv_name in views:
+            transfo = TableInCsv(conn, table_name, csv_name, self.export_table_to_csv, self.csv_folder_output, self.logger)
+            transfo.export_to_csv(date=date)
+
+    def export_csv_column(self, col: str, column_type: str) -> str:
+        """
+        Expression SQL d'une colonne exportée en csv, écrite comme le faisait l'export pandas :
+        booléens en True/False, chaînes vides écrites comme les valeurs NULL (champ vide, sans guillemets).
+        Utilisée par les exports natifs (COPY) des classes enfants, pour que les deux bases écrivent les mêmes fichiers.
+
+        Parameters
+        ----------
+        col : str
+            Nom de la colonne (déjà entre guillemets).
+        column_type : str
+            Type SQL de la colonne.
+
+        Returns
+        -------
+        str
+            Expression SQL de la colonne.
+        """
+        column_type = column_type.upper()
+        if column_type == "BOOLEAN":
+            return f"CASE WHEN {col} THEN 'True' WHEN NOT {col} THEN 'False' END"
+        if column_type.startswith(("VARCHAR", "CHAR", "TEXT")):
+            return f"NULLIF({col}, '')"
+        return col
+
+    def export_table_to_csv(self, conn, table_name: str, path: str):
+        """
+        Écrit une table dans un fichier csv, à partir des dataframes renvoyés par fetch_df.
+        Peut être surchargée par la classe enfant pour utiliser l'export natif de la base.
+
+        Parameters
+        ----------
+        conn : sqlalchemy.engine.base.Connection | duckdb.DuckDBPyConnection
+            Connexion à la base de données.
+        table_name : str
+            Nom de la table à écrire.
+        path : str
+            Chemin du fichier csv.
+        """
+        TableInCsv.write_dataframes(path, self.fetch_df(conn, table_name))
+
+    def load_csv_files(self, conn, csv_files: list):
+        """
+        Charge une liste de fichiers csv dans leurs tables respectives, l'un après l'autre.
+        Peut être surchargée par la classe enfant pour paralléliser les chargements.
+
+        Parameters
+        ----------
+        conn : sqlalchemy.engine.base.Connection | duckdb.DuckDBPyConnection
+            Connexion à la base de données.
+        csv_files : list
+            Fichiers csv à charger.
+        """
+        for csv_file in csv_files:
+            self.load_csv_file(conn, csv_file)
+
+    def create_tables(self):
+        """
+        Création des tables SQL dans la base, à partir des fichiers CREATE TABLE du répertoire 'create_table_directory'.
+        """
+        conn = self.conn
+        for sql_file in Path(self.sql_folder).glob("*.sql"):
+            self.execute_sql_file(conn, sql_file)
+
+    def run(self, create_tables: bool = True):
         """
         Exécute toutes les étapes suivantes :
             - Création des tables SQL dans la base
             - Chargement des CSV et injection dans les tables
             - Vérification de leur création
+
+        Parameters
+        ----------
+        create_tables : bool, optional
+            False si les tables ont déjà été créées au préalable (create_tables), by default True.
         """
         conn = self.conn
-        for sql_file in Path(self.sql_folder).glob("*.sql"):
-            self.execute_sql_file(conn, sql_file)
+        if create_tables:
+            self.create_tables()
 
         self.logger.info(f"Début du chargement des fichiers CSV vers {self.typedb}.")
-        for csv_file in Path(self.csv_folder_input).glob("*.csv"):
-            self.load_csv_file(conn, csv_file)
+        self.load_csv_files(conn, list(Path(self.csv_folder_input).glob("*.csv")))
         self.logger.info(f"Fin du chargement des fichiers CSV vers {self.typedb}.")
 
-        for csv_file in Path(self.csv_folder_input).glob("*.csv"):
-            query_params = {"schema": self.schema, "table": csv_file.stem}
-
-            # Historisation
-            self.historise_table(conn, query_params)
+        # Historisation
+        csv_files = list(Path(self.csv_folder_input).glob("*.csv"))
+        self.historise_tables(conn, [csv_file.stem for csv_file in csv_files])
 
+        for csv_file in csv_files:
+            query_params = {"schema": self.schema, "table": csv_file.stem}
             self.check_table(conn, query_params, print_table=False, show_row_count = True)
 
             # Vérification des données l'historique
@@ -1,16 +1,74 @@
 # === Packages ===
+from __future__ import annotations
 import duckdb
 import os
+import re
+import queue
+import codecs
+import shutil
+import threading
+from contextlib import contextmanager
+from concurrent.futures import ThreadPoolExecutor
+from collections.abc import Iterator
 from pathlib import Path
-import pandas as pd
+from typing import TYPE_CHECKING
 from logging import Logger
 
+if TYPE_CHECKING:
+    # Utilisés uniquement pour les annotations : dataframes et tables Arrow sont produits par DuckDB
+    import pandas as pd
+    import pyarrow as pa
+
 # === Modules ===
-from pipeline.utils.csv_management import ColumnsManagement
+from pipeline.utils.csv_management import ColumnsManagement, CsvHeader, TYPE_MAPPING, NA_VALUES
 from pipeline.database_management.database_pipeline import DataBasePipeline
 
 
+# === Constantes ===
+# Paramètres DuckDB appliqués à chaque connexion, surchargeables via la clé 'settings' du profil
+DUCKDB_SETTINGS = {
+    "threads": os.cpu_count(),
+    "preserve_insertion_order": False,
+}
+# Fuseau horaire de la date d'historisation
+TIMEZONE = "Europe/Paris"
+
+
 # === Classes ===
+# Classe DuckDBConnectionPool qui met à disposition des curseurs sur une même base duckdb
+class DuckDBConnectionPool:
+    def __init__(self, conn, size: int = 4):
+        """
+        Réserve de curseurs DuckDB ouverts sur la même base que la connexion principale.
+        Chaque curseur exécute ses requêtes indépendamment des autres, ce qui permet des traitements en parallèle.
+
+        Parameters
+        ----------
+        conn : duckdb.DuckDBPyConnection
+            Connexion principale à la base DuckDB.
+        size : int, optional
+            Nombre de curseurs de la réserve, by default 4.
+        """
+        self.size = size
+        self.cursors = queue.Queue()
+        for _ in range(size):
+            self.cursors.put(conn.cursor())
+
+    @contextmanager
+    def acquire(self):
+        """ Emprunte un curseur de la réserve, rendu à la fin du bloc 'with'. """
+        cursor = self.cursors.get()
+        try:
+            yield cursor
+        finally:
+            self.cursors.put(cursor)
+
+    def close(self):
+        """ Ferme l'ensemble des curseurs de la réserve. """
+        while not self.cursors.empty():
+            self.cursors.get_nowait().close()
+
+
 # Classe DuckDBPipeline qui gère les actions relatives à une database duckdb
 class DuckDBPipeline(DataBasePipeline):
     def __init__(self, db_config: dict, config: dict, logger: Logger, staging_db_config: dict = None):
@@ -34,38 +92,139 @@ class DuckDBPipeline(DataBasePipeline):
         self.schema = db_config.get("schema")
         self.typedb = db_config.get("type")
         self.staging_db_config = staging_db_config
+        self.pool_size = config.get("pool_size", 4)
+        self.pool = None
+        self.tables_cache = None
+        self.schema_cache = {}
+        self.filled_tables = set()
+        self.metadata_lock = threading.RLock()
+        self.staging_attached = False
         self.init_duckdb()
 
     def init_duckdb(self):
-        """ Vérifie si la base DuckDB existe, sinon la crée. """
-        db_dir = os.path.dirname(self.db_path)
+        """ Crée le dossier de la base DuckDB ; le fichier est créé par duckdb.connect à la première connexion en écriture. """
+        Path(self.db_path).parent.mkdir(parents=True, exist_ok=True)
+
+    def connect(self, read_only: bool = False):
+        """
+        Connexion à la base DuckDB.
+
+        Parameters
+        ----------
+        read_only : bool, optional
+            True pour une connexion en lecture seule (exports), sans verrou exclusif sur le fichier, by default False.
+            Une base ne peut pas être ouverte dans le même processus en lecture seule et en écriture à la fois.
+        """
+        self.logger.info(f"Connexion à la base DuckDB{' (lecture seule)' if read_only else ''}.")
+        self.conn = duckdb.connect(database=self.db_path, read_only=read_only)
+        self.apply_settings(self.conn)
+        self.pool = None
+        self.staging_attached = False
+        self.reset_metadata_cache()
+
+    def apply_settings(self, conn):
+        """
+        Applique les paramètres d'exécution DuckDB (threads, memory_limit, preserve_insertion_order...).
+        Les valeurs de DUCKDB_SETTINGS sont complétées ou remplacées par la clé 'settings' du profil.
+
+        Parameters
+        ----------
+        conn : duckdb.DuckDBPyConnection
+            Connexion à la base DuckDB.
+        """
+        settings = {**DUCKDB_SETTINGS, **(self.db_config.get("settings") or {})}
+        for name, value in settings.items():
+            conn.execute(f"SET {name} = ?", [value])
+
+    def quote_identifier(self, name: str) -> str:
+        """
+        Protège un identifiant SQL (table, colonne) en l'entourant de guillemets doubles.
+
+        Parameters
+        ----------
+        name : str
+            Nom de l'identifiant.
+
+        Returns
+        -------
+        str
+            Identifiant entre guillemets, les guillemets internes étant doublés.
+        """
+        return '"' + name.replace('"', '""') + '"'
+
+    def reset_metadata_cache(self):
+        """ Vide le cache des métadonnées (tables existantes, schémas de table et tables non vides). """
+        with self.metadata_lock:
+            self.tables_cache = None
+            self.schema_cache = {}
+            self.filled_tables = set()
+
+    def load_metadata_cache(self, conn):
+        """
+        Charge en une fois le cache des métadonnées : liste des tables de la base
+        et schéma (nom et type des colonnes) de chaque table du schéma courant.
+        Le cache est partagé par les chargements de csv en parallèle : ses accès passent par metadata_lock.
+
+        Parameters
+        ----------
+        conn : duckdb.DuckDBPyConnection
+            Connexion à la base DuckDB.
+        """
+        tables = {row[0] for row in conn.execute("""
+            SELECT table_name
+            FROM information_schema.tables
+            WHERE table_catalog = current_database()
+        """).fetchall()}
 
-        if db_dir and not os.path.exists(db_dir):
-            os.makedirs(db_dir, exist_ok=True)
-            self.logger.info(f"Dossier créé pour la base DuckDB : {db_dir}")
+        columns_df = conn.execute("""
+            SELECT table_name, column_name, data_type AS column_type
+            FROM information_schema.columns
+            WHERE table_catalog = current_database()
+            AND table_schema = current_schema()
+            ORDER BY table_name, ordinal_position
+        """).fetchdf()
 
-        if not os.path.exists(self.db_path):
-            # self.logger.info("La base DuckDB existe déjà. Suppression en cours...")
-            # os.remove(self.db_path)
-            self.logger.info("Création de la base DuckDB.")
-            conn = duckdb.connect(self.db_path)
-            conn.close()
+        with self.metadata_lock:
+            self.schema_cache = {
+                table_name: df.drop(columns="table_name").reset_index(drop=True)
+                for table_name, df in columns_df.groupby("table_name", sort=False)
+            }
+            self.tables_cache = tables
 
-    def connect(self):
-        """ Connexion à la base DuckDB. """
-        self.logger.info("Connexion à la base DuckDB.")
-        self.conn = duckdb.connect(database=self.db_path)
+    def update_metadata_cache(self, table_name: str, exists: bool = True):
+        """
+        Met à jour le cache des métadonnées après une modification de la structure d'une table.
+
+        Parameters
+        ----------
+        table_name : str
+            Nom de la table créée, modifiée ou supprimée.
+        exists : bool
+            True si la table existe après la modification, False si elle a été supprimée, by default True.
+        """
+        with self.metadata_lock:
+            if self.tables_cache is not None:
+                if exists:
+                    self.tables_cache.add(table_name)
+                else:
+                    self.tables_cache.discard(table_name)
+            if not exists:
+                self.filled_tables.discard(table_name)
+            self.schema_cache.pop(table_name, None)
 
     def is_duckdb_empty(self) -> bool:
         """ Vérifie si la base DuckDB est vide ou non """
-        conn = self.conn
-        result = conn.execute("""
-            SELECT COUNT(*) 
-            FROM information_schema.tables 
-            WHERE table_schema NOT IN ('pg_catalog', 'information_schema')
+        # EXISTS s'arrête à la première table trouvée.
+        # La connexion reste ouverte : sa fermeture est à la charge de close().
+        has_table = self.conn.execute("""
+            SELECT EXISTS (
+                SELECT 1
+                FROM information_schema.tables
+                WHERE table_catalog = current_database()
+                AND table_schema NOT IN ('pg_catalog', 'information_schema')
+            )
         """).fetchone()[0]
-        conn.close()
-        return result == 0
+        return not has_table
 
     def create_table(self, conn, sql_query: str, query_params: dict):
         """
@@ -81,10 +240,12 @@ class DuckDBPipeline(DataBasePipeline):
             Paramètres à injecter dans la requête SQL (Non nécessaire pour duckDB).
         """
         conn.execute(sql_query)
+        self.update_metadata_cache(query_params["table"])
 
     def get_duckdb_schema(self, conn, table_name: str) -> pd.DataFrame:
         """
         Récupération du schéma DuckDB pour une table spécifique.
+        Le schéma est gardé en cache jusqu'à la prochaine modification de la table.
 
         Parameters
         ----------
@@ -98,11 +259,17 @@ class DuckDBPipeline(DataBasePipeline):
         pd.DataFrame
             Schéma de la table contenant le nom des colonnes, leur type et leur format.
         """
-        return conn.execute(f"DESCRIBE {table_name}").fetchdf()
+        with self.metadata_lock:
+            if self.tables_cache is None:
+                self.load_metadata_cache(conn)
+            if table_name not in self.schema_cache:
+                self.schema_cache[table_name] = conn.execute(f"DESCRIBE {self.quote_identifier(table_name)}").fetchdf()
+            return self.schema_cache[table_name].copy()
 
     def is_table_exist(self, conn, query_params: dict, print_log: bool = False) -> bool:
         """
         Indique si la table existe ou non.
+        Les métadonnées sont lues une seule fois (load_metadata_cache), puis tenues à jour par les méthodes qui créent ou suppriment des tables.
 
         Parameters
         ----------
@@ -119,11 +286,10 @@ class DuckDBPipeline(DataBasePipeline):
             True si la table existe (et non vide si applicable), False sinon.
         """
         table_name = query_params['table']
-        table_exists = conn.execute(f"""
-                SELECT COUNT(*)
-                FROM information_schema.tables 
-                WHERE table_name = '{table_name}'
-                """).fetchone()[0]
+        with self.metadata_lock:
+            if self.tables_cache is None:
+                self.load_metadata_cache(conn)
+            table_exists = table_name in self.tables_cache
 
         if table_exists:
             if print_log:
@@ -147,13 +313,13 @@ class DuckDBPipeline(DataBasePipeline):
         """
         table = query_params["table"]
 
-        row_count = conn.execute(f"SELECT COUNT(*) FROM {table}").fetchone()[0]
+        row_count = conn.execute(f"SELECT COUNT(*) FROM {self.quote_identifier(table)}").fetchone()[0]
         if row_count == 0:
             self.logger.warning(f"⚠️ La table '{table}' est vide.")
         else:
             self.logger.info(f"✅ La table '{table}' contient {row_count} lignes.")
 
-    def print_table(self, conn, query_params: dict, limit: int):
+    def print_table(self, conn, query_params: dict, limit: int = 10):
         """
         Affiche les premières lignes d'une table.
 
@@ -168,8 +334,9 @@ class DuckDBPipeline(DataBasePipeline):
         """
         table = query_params["table"]
 
-        df = conn.execute(f"SELECT * FROM {table} LIMIT {limit}").fetchdf()
-        self.logger.info(f"🔍 Aperçu de '{table}' ({limit} lignes) :\n{df.to_string(index=False)}")
+        # Mise en forme réalisée par DuckDB, sans passer par un dataframe pandas
+        preview = conn.sql(f"SELECT * FROM {self.quote_identifier(table)} LIMIT ?", params=[limit])
+        self.logger.info(f"🔍 Aperçu de '{table}' ({limit} lignes) :\n{preview}")
 
     def load_csv_file(self, conn, csv_file: Path):
         """
@@ -184,31 +351,176 @@ class DuckDBPipeline(DataBasePipeline):
         """
         self.logger.info(f"📥 Chargement du fichier : {csv_file}")
         table_name = csv_file.stem
-        self.query_params = {"schema": self.schema, "table": table_name}
+        query_params = {"schema": self.schema, "table": table_name}
 
         # Si la table est inexistante
-        if not self.is_table_exist(conn, self.query_params):
+        if not self.is_table_exist(conn, query_params):
             self.logger.warning(f"Table {table_name} non trouvée, impossible de charger {csv_file.name}")
             return
 
+        # Vérification de la présence de données dans la table (arrêt à la première ligne trouvée).
+        # Inutile si des données y ont déjà été vues ou injectées pendant cette connexion.
+        has_rows = table_name in self.filled_tables or conn.execute(
+            f"SELECT EXISTS (SELECT 1 FROM {self.quote_identifier(table_name)} LIMIT 1)"
+        ).fetchone()[0]
+
+        if has_rows:
+            self.filled_tables.add(table_name)
+            self.logger.info(f"Données déjà présentes dans {table_name}, passage du fichier CSV : {csv_file.name}")
+            return
+
+        # Schéma de la table, récupéré seulement si des données sont à injecter
         schema_df = self.get_duckdb_schema(conn, table_name)
+        self.logger.info(f"🆕 Injection dans la table '{table_name}' à partir du CSV {csv_file}")
+
+        # Lecture du csv par DuckDB, sans passer par pandas
+        try:
+            self.load_csv_native(conn, csv_file, table_name, schema_df)
+            self.filled_tables.add(table_name)
+            self.logger.info(f"✅ Table '{table_name}' créée et remplie avec succès ({csv_file})")
+            return
+        except duckdb.Error as e:
+            self.logger.warning(f"⚠️ Lecture DuckDB impossible pour {csv_file.name} ({e}) → lecture via pandas.")
 
         # Chargement du csv
         pipeline = ColumnsManagement(csv_file=csv_file, schema_df=schema_df, logger=self.logger)
-        df = pipeline.df
+        arrow_tbl = pipeline.arrow_table
 
-        # Vérification de la présence de la table
-        row_count = conn.execute(f"SELECT COUNT(*) FROM {table_name}").fetchone()[0]
+        try:
+            self.append_arrow_table(conn, table_name, arrow_tbl, schema_df["column_name"].tolist())
+            self.filled_tables.add(table_name)
+            self.logger.info(f"✅ Table '{table_name}' créée et remplie avec succès ({csv_file})")
+        except duckdb.Error as e:
+            self.logger.error(f"Erreur lors du chargement de {csv_file.name}: {e}")
 
-        if row_count > 0:
-            self.logger.info(f"Données déjà présentes dans {table_name}, passage du fichier CSV : {csv_file.name}")
-        else:
-            self.logger.info(f"🆕 Injection dans la table '{table_name}' à partir du CSV {csv_file}")
+    def load_csv_files(self, conn, csv_files: list):
+        """
+        Charge les fichiers csv en parallèle, chaque fichier étant chargé par un curseur de la réserve.
+        Le nombre de chargements simultanés est défini par 'pool_size' (metadata.yml), 4 par défaut.
+        La réserve est créée au premier appel et conservée jusqu'à la fermeture de la connexion.
+
+        Parameters
+        ----------
+        conn : duckdb.DuckDBPyConnection
+            Connexion à la base de données.
+        csv_files : list
+            Fichiers csv à charger.
+        """
+        if len(csv_files) < 2 or self.pool_size < 2:
+            return super().load_csv_files(conn, csv_files)
+
+        if self.pool is None:
+            self.pool = DuckDBConnectionPool(conn, self.pool_size)
+
+        def load(csv_file: Path):
+            with self.pool.acquire() as cursor:
+                self.load_csv_file(cursor, csv_file)
+
+        with ThreadPoolExecutor(max_workers=min(self.pool.size, len(csv_files))) as executor:
+            for future in [executor.submit(load, csv_file) for csv_file in csv_files]:
+                future.result()
+
+    def load_csv_native(self, conn, csv_file: Path, table_name: str, schema_df: pd.DataFrame):
+        """
+        Charge un fichier CSV avec le lecteur csv de DuckDB (read_csv), sans passer par pandas.
+        Les colonnes sont lues en texte puis converties en SQL, avec les mêmes règles que ColumnsManagement :
+        les colonnes absentes du csv prennent la valeur par défaut de leur type, les colonnes en trop sont ignorées.
+
+        Parameters
+        ----------
+        conn : duckdb.DuckDBPyConnection
+            Connexion à la base de données.
+        csv_file : Path
+            Fichier csv.
+        table_name : str
+            Nom de la table cible.
+        schema_df : pd.DataFrame
+            Schéma de la table (DESCRIBE).
+        """
+        header = CsvHeader(csv_file, self.logger)
+        table_columns = schema_df["column_name"].tolist()
+
+        # Même contrôle (et mêmes messages) que ColumnsManagement.check_missing_columns
+        missing_columns = set(table_columns) - set(header.columns)
+        extra_columns = set(header.columns) - set(table_columns)
+        if missing_columns:
+            self.logger.warning(f"Colonnes manquantes dans {csv_file.name} : {missing_columns}")
+        if extra_columns:
+            self.logger.warning(f"Colonnes en trop dans {csv_file.name} : {extra_columns}")
+
+        select = ", ".join(
+            f'{self.cast_csv_column("NULL" if row["column_name"] in missing_columns else self.quote_identifier(row["column_name"]), str(row["column_type"]))}'
+            f' AS {self.quote_identifier(row["column_name"])}'
+            for _, row in schema_df.iterrows()
+        )
+        conn.execute(f"""
+            INSERT INTO {self.quote_identifier(table_name)} BY NAME
+            SELECT {select}
+            FROM read_csv(?, header = true, delim = ?, quote = '"', all_varchar = true,
+                          names = ?, nullstr = ?, null_padding = true)
+        """, [str(csv_file), header.delimiter, header.columns, NA_VALUES])
+
+    def cast_csv_column(self, col: str, column_type: str) -> str:
+        """
+        Expression SQL de conversion d'une colonne csv lue en texte vers le type de la table.
+        Reproduit ColumnsManagement.convert_columns_type (valeurs vides à 0 ou False, dates au format JJ-MM-AAAA...).
+
+        Parameters
+        ----------
+        col : str
+            Expression SQL de la colonne texte : nom protégé de la colonne, ou NULL si elle est absente du csv.
+        column_type : str
+            Type SQL de la colonne dans la table (ex: VARCHAR(50), INTEGER).
+
+        Returns
+        -------
+        str
+            Expression SQL de la colonne convertie.
+        """
+        base_type = re.match(r"^(\w+)", column_type)
+        length = re.search(r"\((\d+)\)", column_type)
+        conversion = TYPE_MAPPING.get(base_type.group(1)) if base_type else None
+
+        if conversion == "int":
+            return f"CAST(TRUNC(COALESCE(CAST(NULLIF({col}, 'nan') AS DOUBLE), 0)) AS BIGINT)"
+        elif conversion == "float":
+            return f"COALESCE(CAST(NULLIF({col}, 'nan') AS DOUBLE), 0)"
+        elif conversion == "bool":
+            return f"({col} IS NOT NULL AND {col} <> '')"
+        elif conversion == "datetime64":
+            return f"TRY_STRPTIME({col}, '%d-%m-%Y')"
+        elif conversion == "string":
+            if length:
+                return f"LEFT(COALESCE({col}, ''), {length.group(1)})"
+            return f"COALESCE({col}, '')"
+        return col
+
+    def append_arrow_table(self, conn, table_name: str, arrow_tbl: pa.Table, columns: list):
+        """
+        Ajoute le contenu d'une table Arrow à une table DuckDB.
+        L'ajout passe par l'API relationnelle (sans analyse d'une requête SQL), les colonnes étant
+        remises dans l'ordre de la table cible. En cas d'incompatibilité, l'insertion se fait par nom de colonne.
+
+        Parameters
+        ----------
+        conn : duckdb.DuckDBPyConnection
+            Connexion à la base de données.
+        table_name : str
+            Nom de la table cible.
+        arrow_tbl : pa.Table
+            Données à insérer.
+        columns : list
+            Colonnes de la table cible, dans l'ordre de la table.
+        """
+        try:
+            conn.from_arrow(arrow_tbl.select(columns)).insert_into(table_name)
+        except (duckdb.Error, KeyError) as e:
+            self.logger.warning(f"⚠️ Ajout direct impossible dans '{table_name}' ({e}) → insertion par nom de colonne.")
+            conn.register("arrow_tbl", arrow_tbl)
             try:
-                conn.execute(f"INSERT INTO {table_name} SELECT * FROM df")
-                self.logger.info(f"✅ Table '{table_name}' créée et remplie avec succès ({csv_file})")
-            except duckdb.Error as e:
-                self.logger.error(f"Erreur lors du chargement de {csv_file.name}: {e}")
+                conn.execute(f"INSERT INTO {self.quote_identifier(table_name)} BY NAME SELECT * FROM arrow_tbl")
+            finally:
+                conn.unregister("arrow_tbl")
 
     def list_tables(self, conn):
         """
@@ -220,23 +532,28 @@ class DuckDBPipeline(DataBasePipeline):
             Connexion à la base de données.
         """
         try:
-            tables = conn.execute("SELECT table_schema, table_name FROM information_schema.tables").fetchall()
+            tables = conn.execute("""
+                SELECT table_schema, table_name
+                FROM information_schema.tables
+                WHERE table_catalog = current_database()
+            """).fetchall()
 
             if not tables:
                 self.logger.warning("Aucune table trouvée dans la base DuckDB.")
                 return
 
-            self.logger.info("Tables disponibles dans DuckDB :")
-            for schema, table in tables:
-                self.logger.info(f" - {schema}.{table}")
+            # Un seul enregistrement de log pour l'ensemble des tables
+            tables_list = "\n".join(f" - {schema}.{table}" for schema, table in tables)
+            self.logger.info(f"Tables disponibles dans DuckDB :\n{tables_list}")
 
         except Exception as e:
             self.logger.error(f"Erreur lors de la récupération des tables : {e}")
 
-    def fetch_df(self, conn, table_name: str) -> pd.DataFrame:
+    def fetch_df(self, conn, table_name: str, batch_size: int = 100_000) -> Iterator[pd.DataFrame]:
         """
         Fonction de chargement d'une table depuis une base DuckDB.
         Importante pour l'export des csv.
+        La table est lue par blocs Arrow (RecordBatch) afin de borner la mémoire utilisée à l'export.
 
         Parameters
         ----------
@@ -244,15 +561,129 @@ class DuckDBPipeline(DataBasePipeline):
             Connexion à la base de données.
         table_name : str
             Nom de la table que l'on charge.
+        batch_size : int, optional
+            Nombre de lignes par bloc, par défaut 100 000.
 
-        Returns
-        -------
+        Yields
+        ------
         pd.DataFrame
-            Dataframe de la table chargée.
+            Bloc de la table chargée. Un dataframe vide est renvoyé si la table ne contient aucune ligne.
         """
-        df = conn.execute(f"SELECT * FROM {table_name}").fetchdf()
-        return df
+        reader = conn.execute(f"SELECT * FROM {self.quote_identifier(table_name)}").fetch_record_batch(batch_size)
+        is_empty = True
+        for batch in reader:
+            is_empty = False
+            yield batch.to_pandas()
+        if is_empty:
+            yield reader.schema.empty_table().to_pandas()
 
+    def export_table_to_csv(self, conn, table_name: str, path: str):
+        """
+        Écrit une table dans un fichier csv avec l'export natif de DuckDB (COPY ... TO), sans passer par pandas.
+        Le fichier garde le format des exports : en-tête, séparateur ';', encodage utf-8-sig (BOM)
+        et valeurs écrites comme par pandas (export_csv_column).
+
+        Parameters
+        ----------
+        conn : duckdb.DuckDBPyConnection
+            Connexion à la base de données.
+        table_name : str
+            Nom de la table à écrire.
+        path : str
+            Chemin du fichier csv.
+        """
+        table = self.quote_identifier(table_name)
+        select = ", ".join(
+            f"{self.export_csv_column(self.quote_identifier(name), str(column_type))} AS {self.quote_identifier(name)}"
+            for name, column_type in conn.execute(f"SELECT column_name, column_type FROM (DESCRIBE {table})").fetchall()
+        )
+        tmp_path = f"{path}.tmp"
+        tmp_sql_path = tmp_path.replace("'", "''")
+        try:
+            conn.execute(f"COPY (SELECT {select} FROM {table}) TO '{tmp_sql_path}' (FORMAT csv, HEADER, DELIMITER ';')")
+
+            # COPY n'écrit pas de BOM : il est ajouté en tête du fichier final
+            with open(path, "wb") as f, open(tmp_path, "rb") as tmp:
+                f.write(codecs.BOM_UTF8)
+                shutil.copyfileobj(tmp, f)
+        finally:
+            if os.path.exists(tmp_path):
+                os.remove(tmp_path)
+
+    def attach_staging(self, conn):
+        """
+        Attache la base Staging en lecture seule sous le nom 'staging_db'.
+        L'attachement est fait une seule fois par connexion et conservé jusqu'à sa fermeture.
+
+        Parameters
+        ----------
+        conn : duckdb.DuckDBPyConnection
+            Connexion à la base de données.
+        """
+        if self.staging_attached:
+            return
+        staging_db_path = str(Path(self.staging_db_config.get("path"))).replace("'", "''")
+        conn.execute(f"ATTACH IF NOT EXISTS '{staging_db_path}' AS staging_db (READ_ONLY)")
+        self.staging_attached = True
+
+    def copy_table(self, views_to_import: dict):
+        """
+        Copie des tables de staging vers la base cible, toutes dans une seule transaction.
+        La base Staging est attachée une seule fois ; en cas d'erreur, la transaction est annulée
+        et les tables sont copiées une par une (copy_table_from_staging), chaque erreur étant alors propre à sa table.
+
+        Parameters
+        ----------
+        views_to_import : dict
+            Liste des vues à importer.
+        """
+        if not self.staging_db_config:
+            self.logger.error("❌ La configuration de la base Staging n'a pas été indiquée.")
+            return
+
+        tables = []
+        for staging_table_name, db_table_name in views_to_import.items():
+            if staging_table_name:
+                tables.append((staging_table_name, db_table_name))
+            else:
+                self.logger.warning("⚠️ Aucune table spécifiée")
+        if len(tables) < 2:
+            return super().copy_table(dict(tables))
+
+        conn = self.conn
+        staging_schema = self.staging_db_config.get("schema") or "main"
+        database, schema = conn.execute("SELECT current_database(), current_schema()").fetchone()
+        target_schema = f"{self.quote_identifier(database)}.{self.quote_identifier(schema)}"
+        try:
+            self.attach_staging(conn)
+
+            # Les tables et vues sont résolues dans le schéma de la base staging
+            conn.execute(f"USE staging_db.{self.quote_identifier(staging_schema)}")
+            conn.begin()
+            for staging_table_name, db_table_name in tables:
+                conn.execute(f"""
+                    CREATE TABLE IF NOT EXISTS {target_schema}.{self.quote_identifier(db_table_name)} AS
+                    SELECT * FROM {staging_table_name}
+                """)
+            conn.commit()
+            copied = True
+        except Exception as e:
+            self.logger.warning(f"⚠️ Copie groupée des tables de staging impossible, copie table par table : {e}")
+            try:
+                conn.rollback()
+            except duckdb.Error:
+                # Aucune transaction en cours (erreur avant BEGIN)
+                pass
+            copied = False
+        finally:
+            conn.execute(f"USE {target_schema}")
+
+        if not copied:
+            return super().copy_table(dict(tables))
+
+        for staging_table_name, db_table_name in tables:
+            self.update_metadata_cache(db_table_name)
+            self.logger.info(f"✅ La table {staging_table_name} a bien été récupérée de la base DuckDB Staging sous le nom {db_table_name}.")
 
     def copy_table_from_staging(self, conn, staging_table_name: str, db_table_name: str):
         """
@@ -266,22 +697,24 @@ class DuckDBPipeline(DataBasePipeline):
             Nom de la table que l'on "colle". 
         """
         if self.staging_db_config:
-            query_params = {"schema": self.schema, "table": db_table_name}
-
             # Récupération de la table dans Staging
-            staging_db_path = Path(self.staging_db_config.get("path"))
-            
-            # Connexion à la base staging
-            staging_conn = duckdb.connect(staging_db_path)
-            df = staging_conn.execute(f"SELECT * FROM {staging_table_name}").fetchdf()
-            staging_conn.close()
+            staging_schema = self.staging_db_config.get("schema") or "main"
 
             try:
-                conn.register("staging_data", df)
-                conn.execute(f"""
-                    CREATE TABLE IF NOT EXISTS {db_table_name} AS
-                    SELECT * FROM staging_data
-                """)
+                # Base staging attachée en lecture seule : la copie est faite par DuckDB, sans passer par Python
+                database, schema = conn.execute("SELECT current_database(), current_schema()").fetchone()
+                self.attach_staging(conn)
+
+                # Les tables et vues sont résolues dans le schéma de la base staging
+                conn.execute(f"USE staging_db.{self.quote_identifier(staging_schema)}")
+                try:
+                    conn.execute(f"""
+                        CREATE TABLE IF NOT EXISTS {self.quote_identifier(database)}.{self.quote_identifier(schema)}.{self.quote_identifier(db_table_name)} AS
+                        SELECT * FROM {staging_table_name}
+                    """)
+                finally:
+                    conn.execute(f"USE {self.quote_identifier(database)}.{self.quote_identifier(schema)}")
+                self.update_metadata_cache(db_table_name)
 
                 self.logger.info(f"✅ La table {staging_table_name} a bien été récupérée de la base DuckDB Staging sous le nom {db_table_name}.")
                 
@@ -291,9 +724,43 @@ class DuckDBPipeline(DataBasePipeline):
         else:
             self.logger.error("❌ La configuration de la base Staging n'a pas été indiquée.")
 
-    def copy_table_into_new(self, conn, source: str, target: str):
+    def historise_table(self, conn, query_params: dict):
+        """
+        Historise les données d'une table dans sa ztable, au sein d'une seule transaction.
+        La date d'ingestion est calculée pendant la copie, sans ALTER TABLE ni UPDATE sur la ztable.
+        En cas d'erreur, la transaction est annulée et la ztable reste dans son état précédent.
+
+        Parameters
+        ----------
+        conn : duckdb.DuckDBPyConnection
+            Connexion à la base DuckDB.
+        query_params : dict
+            Paramètres à injecter dans la requête SQL.
+        """
+        table_name = query_params["table"]
+        table_name_histo = f"z{table_name}"
+        query_params_histo = query_params.copy()
+        query_params_histo['table'] = table_name_histo
+
+        conn.begin()
+        try:
+            # Création ou alimentation de la table historique, avec la date du jour
+            if not self.is_table_exist(conn, query_params_histo):
+                self.copy_table_into_new(conn, table_name, table_name_histo, date_column="date_ingestion")
+            else:
+                self.append_table(conn, table_name, table_name_histo, date_column="date_ingestion")
+            conn.commit()
+            self.logger.info(f"✅ Données de {table_name} historisées avec succès dans {table_name_histo}")
+
+        except Exception as e:
+            conn.rollback()
+            self.reset_metadata_cache()
+            self.logger.error(f"❌ Erreur lors de l'historisation : {e}")
+            raise
+
+    def copy_table_into_new(self, conn, source: str, target: str, date_column: str = None):
         """
-        Copie une table dans une nouvelle.
+        Copie une table dans une nouvelle (remplacée si elle existe déjà).
 
         Parameters
         ----------
@@ -303,12 +770,20 @@ class DuckDBPipeline(DataBasePipeline):
             Nom de la table que l'on "copie".
         target : str
             Nom de la table à laquelle on ajoute les données de la première.
-        """
-        query = f"CREATE TABLE {target} AS SELECT * FROM {source}"
-        conn.execute(query)
+        date_column : str, optional
+            Colonne ajoutée à la copie et remplie avec la date du jour, None by default.
+        """
+        query = f"CREATE OR REPLACE TABLE {self.quote_identifier(target)} AS SELECT *"
+        params = []
+        if date_column:
+            query += f", timezone(?, CURRENT_TIMESTAMP) AS {self.quote_identifier(date_column)}"
+            params.append(TIMEZONE)
+        query += f" FROM {self.quote_identifier(source)}"
+        conn.execute(query, params)
+        self.update_metadata_cache(target)
         self.logger.info(f"✅ Table {source} copiée vers {target}")
 
-    def append_table(self, conn, source: str, target: str):
+    def append_table(self, conn, source: str, target: str, date_column: str = None):
         """
         Ajoute les données de la table source à la table target.
         Seules les colonnes communes seront copiées.
@@ -321,58 +796,59 @@ class DuckDBPipeline(DataBasePipeline):
             Nom de la table que l'on "copie".
         target : str
             Nom de la table à laquelle on ajoute les données de la première. 
-
+        date_column : str, optional
+            Colonne de la table target remplie avec la date du jour pour les lignes ajoutées, None by default.
         """
         # Récupérer les colonnes des deux tables
-        source_cols = [row[1] for row in conn.execute(
-            f"PRAGMA table_info('{source}')").fetchall()]
-        target_cols = [row[1] for row in conn.execute(
-            f"PRAGMA table_info('{target}')").fetchall()]
+        source_cols = self.get_duckdb_schema(conn, source)["column_name"].tolist()
+        target_cols = self.get_duckdb_schema(conn, target)["column_name"].tolist()
 
         # Colonnes communes
-        common_cols = [col for col in source_cols if col in target_cols]
-
-        cols_str = ", ".join([f'"{col}"' for col in common_cols])
+        common_cols = [col for col in source_cols if col in target_cols and col != date_column]
+        select_cols = [self.quote_identifier(col) for col in common_cols]
+        params = []
+
+        if date_column:
+            # Ancienne ztable sans colonne de date : elle est ajoutée (et remplie) avant l'insertion
+            if date_column not in target_cols:
+                self.add_current_date(conn, target, date_column)
+            select_cols.append(f"timezone(?, CURRENT_TIMESTAMP) AS {self.quote_identifier(date_column)}")
+            params.append(TIMEZONE)
+
+        # BY NAME : les colonnes sont associées par nom, quel que soit leur ordre dans les deux tables
         query = f"""
-            INSERT INTO {target} ({cols_str})
-            SELECT {cols_str} FROM {source}
+            INSERT INTO {self.quote_identifier(target)} BY NAME
+            SELECT {", ".join(select_cols)} FROM {self.quote_identifier(source)}
         """
-        conn.execute(query)
+        conn.execute(query, params)
         self.logger.info(f"✅ Données de {source} ajoutées à {target}")
 
     def add_current_date(self, conn, table_name: str, column_name: str):
         """
-        Ajoute la date du jour (date d'historisation) à une table.
+        Ajoute la date du jour (date d'historisation) à une table, si la colonne n'existe pas encore.
 
         Parameters
         ----------
         conn : duckdb.DuckDBPyConnection
             Connexion à la base DuckDB.
         table_name : str
-            Nom de la table à vider.
+            Nom de la table.
         column_name : str
             Nom de la colonne date.
         """
-        tz = "Europe/Paris"
-        
         # Vérifier que la colonne existe
-        check_query = f"""
-            SELECT column_name
-            FROM information_schema.columns
-            WHERE table_name = '{table_name}'
-            AND column_name = '{column_name}'
-        """
-        column_exists = conn.execute(check_query).fetchone()
+        if column_name in self.get_duckdb_schema(conn, table_name)["column_name"].values:
+            return
 
-        if not column_exists:
-            conn.execute(f'ALTER TABLE "{table_name}" ADD COLUMN {column_name} TIMESTAMP')
-            self.logger.info(f"Colonne {column_name} créée dans la table {table_name}")
-        
-        conn.execute(f'''
-            UPDATE "{table_name}"
-            SET {column_name} = timezone('{tz}', CURRENT_TIMESTAMP)
-            WHERE {column_name} IS NULL
-        ''')
+        # La valeur par défaut remplit les lignes existantes lors de l'ajout, sans UPDATE de la table
+        timezone = TIMEZONE.replace("'", "''")
+        conn.execute(f"""
+            ALTER TABLE {self.quote_identifier(table_name)}
+            ADD COLUMN IF NOT EXISTS {self.quote_identifier(column_name)} TIMESTAMP
+            DEFAULT timezone('{timezone}', CURRENT_TIMESTAMP)
+        """)
+        self.update_metadata_cache(table_name)
+        self.logger.info(f"Colonne {column_name} créée dans la table {table_name}")
 
     def drop_column(self, conn, table_name: str, column_name: str):
         """
@@ -387,8 +863,9 @@ class DuckDBPipeline(DataBasePipeline):
         column_name : str
             Nom de la colonne à supprimer.
         """
-        query = f'ALTER TABLE "{table_name}" DROP COLUMN "{column_name}"'
+        query = f"ALTER TABLE {self.quote_identifier(table_name)} DROP COLUMN {self.quote_identifier(column_name)}"
         conn.execute(query)
+        self.update_metadata_cache(table_name)
 
     def truncate_table(self, conn, table_name: str):
         """
@@ -401,9 +878,10 @@ class DuckDBPipeline(DataBasePipeline):
         table_name : str
             Nom de la table à vider.
         """
-        conn.execute(f"TRUNCATE TABLE {table_name}")
+        conn.execute(f"TRUNCATE TABLE {self.quote_identifier(table_name)}")
+        self.filled_tables.discard(table_name)
 
-    def drop_table(self, conn, query_params: dict):
+    def drop_table(self, conn, query_params: dict, views: list = None):
         """
         Supprime une table et les vues qui lui sont liées dans DuckDB.
 
@@ -415,25 +893,33 @@ class DuckDBPipeline(DataBasePipeline):
             Paramètres à injecter dans la requête SQL.
             - "table": nom de la table
             - "schema": nom du schéma (par défaut 'main' dans DuckDB)
+        views : list, optional
+            Vues dépendantes (schéma, nom) si elles sont déjà connues, recherchées dans le catalogue sinon. None by default.
         """
         schema = query_params["schema"]
         table_name = query_params["table"]
 
-        # Vérification des vues dépendantes
-        views = conn.execute(f"""
-            SELECT table_schema, table_name
-            FROM information_schema.views
-            WHERE table_schema = '{schema}'
-            AND view_definition ILIKE '%{table_name}%'
-        """).fetchall()
+        # Vérification des vues dépendantes.
+        # DuckDB ne trace pas les dépendances des vues (duckdb_dependencies() est vide) : on recherche le nom
+        # de la table comme mot entier dans leur définition, pour ne pas retenir 'zt1' ou 't10' quand on supprime 't1'.
+        if views is None:
+            views = conn.execute("""
+                SELECT table_schema, table_name
+                FROM information_schema.views
+                WHERE table_catalog = current_database()
+                AND table_schema = ?
+                AND regexp_matches(view_definition, '\\b' || regexp_escape(?) || '\\b', 'i')
+            """, [schema, table_name]).fetchall()
 
         for view_schema, view in views:
             self.logger.info(f"🗑 Vue '{view_schema}.{view}' → suppression totale (DROP VIEW)")
-            conn.execute(f'DROP VIEW IF EXISTS "{view_schema}"."{view}"')
+            conn.execute(f"DROP VIEW IF EXISTS {self.quote_identifier(view_schema)}.{self.quote_identifier(view)}")
+            self.update_metadata_cache(view, exists=False)
 
         # Suppression de la table
         self.logger.info(f"🗑 Table '{schema}.{table_name}' → suppression totale (DROP TABLE)")
-        conn.execute(f'DROP TABLE IF EXISTS "{schema}"."{table_name}"')
+        conn.execute(f"DROP TABLE IF EXISTS {self.quote_identifier(schema)}.{self.quote_identifier(table_name)}")
+        self.update_metadata_cache(table_name, exists=False)
 
     def reset_histo(self):
         """
@@ -449,30 +935,50 @@ class DuckDBPipeline(DataBasePipeline):
         conn = self.conn
         schema = self.schema
 
-        # Récupération des tables
-        query = f"""
-            SELECT table_name
-            FROM information_schema.tables
-            WHERE table_schema = ?
-            AND table_name LIKE 'z%';
-        """
-        tables = [row[0] for row in conn.execute(query, [schema]).fetchall()]
+        # Récupération des tables et de leurs vues dépendantes, en une seule requête
+        query = """
+            SELECT t.table_name,
+                   coalesce(list((v.table_schema, v.table_name)) FILTER (WHERE v.table_name IS NOT NULL), []) AS views
+            FROM information_schema.tables t
+            LEFT JOIN information_schema.views v
+                ON v.table_catalog = t.table_catalog
+                AND v.table_schema = t.table_schema
+                AND regexp_matches(v.view_definition, '\\b' || regexp_escape(t.table_name) || '\\b', 'i')
+            WHERE t.table_catalog = current_database()
+            AND t.table_schema = ?
+            AND t.table_type = 'BASE TABLE'
+            AND t.table_name LIKE 'z%'
+            GROUP BY t.table_name
+        """
+        tables = conn.execute(query, [schema]).fetchall()
 
         if not tables:
             self.logger.info(f"Aucune table 'z%' trouvée dans le schéma {schema}")
             return
 
-        # Suppression des tables
+        # Suppression des tables, au sein d'une seule transaction
+        dropped_views = set()
+        conn.begin()
         try:
-            for table in tables:
+            for table, views in tables:
+                # Une vue peut dépendre de plusieurs tables historiques : elle n'est supprimée qu'une fois
+                views = [view for view in views if view not in dropped_views]
+                dropped_views.update(views)
+
                 query_params = {"schema": schema, "table": table}
-                self.drop_table(conn, query_params)
+                self.drop_table(conn, query_params, views=views)
                 self.logger.info(f"✅ Table {schema}.{table} supprimée")
+            conn.commit()
         except Exception as e:
+            conn.rollback()
+            self.reset_metadata_cache()
             self.logger.error(f"❌ Erreur lors de la réinitialisation de l'historique : {e}")
             raise
     
     def close(self):
         """ Ferme la connexion à la base de données Duckdb. """
+        if self.pool is not None:
+            self.pool.close()
+            self.pool = None
         self.conn.close()
         self.logger.info("Connexion à DuckDB fermée.")
@@ -1,18 +1,76 @@
 # === Packages ===
 import pandas as pd
-from sqlalchemy import create_engine, inspect, text
-from dotenv import load_dotenv
+from sqlalchemy import create_engine, text
 from pathlib import Path
+from io import StringIO
+from tempfile import SpooledTemporaryFile
+from typing import IO
+from contextlib import contextmanager
+from concurrent.futures import ThreadPoolExecutor
+import threading
+import re
+import codecs
 import urllib.parse
+import functools
 from logging import Logger
 
 # === Modules ===
-from pipeline.utils.csv_management import ColumnsManagement
+from pipeline.utils.csv_management import ColumnsManagement, CsvHeader, TableInCsv, TYPE_MAPPING, NA_VALUES
 from pipeline.database_management.database_pipeline import DataBasePipeline
 from pipeline.utils.load_yml import resolve_env_var
 
-# === Chargement des variables d’environnement ===
-load_dotenv()
+
+# === Constantes ===
+# Taille maximale (en octets) gardée en mémoire lors d'une copie entre bases, avant écriture sur disque
+COPY_SPOOL_SIZE = 64 * 1024 * 1024
+# Fuseau horaire de la date d'historisation
+TIMEZONE = "Europe/Paris"
+# Paramètres appliqués à la transaction d'un chargement massif (bulk_load)
+BULK_LOAD_SETTINGS = {
+    "synchronous_commit": "off",
+    "maintenance_work_mem": "1GB"
+}
+
+
+# === Fonctions ===
+@functools.lru_cache(maxsize=None)
+def get_engine(user: str, password: str, host: str, port: str, database: str, pool_size: int = 4):
+    """
+    Moteur SQLAlchemy d'une base postgres, créé une seule fois par base :
+    les appels suivants réutilisent le même moteur et son pool de connexions.
+
+    Parameters
+    ----------
+    user : str
+        Utilisateur de la base.
+    password : str
+        Mot de passe, tel qu'écrit dans la configuration (variable d'environnement résolue ici).
+    host : str
+        Hôte de la base.
+    port : str
+        Port de la base.
+    database : str
+        Nom de la base.
+    pool_size : int, optional
+        Nombre de connexions gardées ouvertes dans le pool, by default 4.
+
+    Returns
+    -------
+    sqlalchemy.engine.Engine
+        Moteur de la base.
+    """
+    password = urllib.parse.quote(resolve_env_var(password))
+    url = f"postgresql+psycopg2://{user}:{password}@{host}:{port}/{database}"
+    return create_engine(
+        url,
+        pool_size=pool_size,
+        pool_pre_ping=True,
+        pool_recycle=3600,
+        # Insertions multiples (executemany) regroupées par pages de 5000 lignes
+        executemany_mode="values_plus_batch",
+        insertmanyvalues_page_size=5000,
+        executemany_batch_page_size=5000
+        )
 
 
 # === Classes ===
@@ -38,20 +96,26 @@ class PostgreSQLLoader(DataBasePipeline):
         self.typedb = "postgres"
         self.schema = db_config["schema"]
         self.db_name = db_config["dbname"]
-        self.engine = self.init_engine(
-            db_config["user"],
-            urllib.parse.quote(resolve_env_var(db_config["password"])),
-            db_config["host"],
-            db_config["port"],
-            self.db_name
-            )
+        self.pool_size = config.get("pool_size", 4)
+        self.engine = self.init_engine(db_config)
+        self.tables_cache = None
+        self.schema_cache = {}
+        self.metadata_lock = threading.RLock()
 
-    def init_engine(self, user: str, password: str, host: str, port: str, database: str):
-        """ Initialisation de la connexion postgres. """
+    def init_engine(self, db_config: dict):
+        """
+        Initialisation de la connexion postgres (moteur partagé par base, avec pool de connexions).
+        Le pool garde ouvertes une connexion par chargement parallèle ('pool_size') en plus de la connexion principale.
+        """
         try:
-            url = f"postgresql+psycopg2://{user}:{password}@{host}:{port}/{database}"
-            engine = create_engine(url)
-            return engine
+            return get_engine(
+                db_config["user"],
+                db_config["password"],
+                db_config["host"],
+                str(db_config["port"]),
+                db_config["dbname"],
+                self.pool_size + 1
+                )
         except Exception as e:
             self.logger.error(f"Erreur de connexion PostgreSQL : {e}")
             raise
@@ -59,8 +123,144 @@ class PostgreSQLLoader(DataBasePipeline):
     def connect(self):
         """ Connexion à la base postgres. """
         self.conn = self.engine.connect()
+        self.reset_metadata_cache()
         self.logger.info("Connexion PostgreSQL établie avec succès.")
 
+    @contextmanager
+    def session(self):
+        """ Connexion à la base postgres le temps d'un bloc 'with', rendue au pool à la sortie. """
+        self.connect()
+        try:
+            yield self.conn
+        finally:
+            self.close()
+
+    def qualified_name(self, table_name: str) -> str:
+        """
+        Nom complet et protégé d'une table du schéma de la base ("schema"."table") : la table est trouvée
+        sans dépendre du search_path de la connexion.
+
+        Parameters
+        ----------
+        table_name : str
+            Nom de la table.
+
+        Returns
+        -------
+        str
+            Nom de la table préfixé par son schéma, entre guillemets.
+        """
+        return f'"{self.schema}"."{table_name}"'
+
+    def reset_metadata_cache(self):
+        """ Vide le cache des métadonnées (tables existantes et schémas des tables). """
+        with self.metadata_lock:
+            self.tables_cache = None
+            self.schema_cache = {}
+
+    def read_columns(self, conn, table_name: str = None) -> pd.DataFrame:
+        """
+        Lit le nom et le type des colonnes des tables du schéma (ou d'une seule table).
+        Les types sont écrits comme ceux de SQLAlchemy (VARCHAR(50), INTEGER, TIMESTAMP WITHOUT TIME ZONE...),
+        pour rester compatibles avec la conversion des colonnes de ColumnsManagement.
+
+        Parameters
+        ----------
+        conn : sqlalchemy.engine.base.Connection
+            Connexion à la base postgres.
+        table_name : str, optional
+            Nom de la table, toutes les tables du schéma si None, None by default.
+
+        Returns
+        -------
+        pd.DataFrame
+            Colonnes table_name, column_name et column_type, dans l'ordre des colonnes de chaque table.
+        """
+        # Lecture directe du catalogue (pg_attribute), plus rapide que la vue information_schema.columns
+        query = """
+            SELECT
+                c.relname AS table_name,
+                a.attname AS column_name,
+                UPPER(regexp_replace(
+                    regexp_replace(format_type(a.atttypid, a.atttypmod), '^character varying', 'varchar'),
+                    '^character', 'char'
+                )) AS column_type
+            FROM pg_attribute AS a
+            JOIN pg_class AS c ON c.oid = a.attrelid
+            JOIN pg_namespace AS n ON n.oid = c.relnamespace
+            WHERE n.nspname = :schema
+            AND c.relkind IN ('r', 'p', 'v', 'm', 'f')
+            AND a.attnum > 0
+            AND NOT a.attisdropped
+        """
+        params = {"schema": self.schema}
+        if table_name:
+            query += " AND c.relname = :table"
+            params["table"] = table_name
+        query += " ORDER BY c.relname, a.attnum"
+
+        rows = conn.execute(text(query), params).fetchall()
+        return pd.DataFrame(rows, columns=["table_name", "column_name", "column_type"])
+
+    def load_metadata_cache(self, conn):
+        """
+        Charge en une fois le cache des métadonnées : liste des tables du schéma
+        et schéma (nom et type des colonnes) de chacune de ces tables, lus par une seule requête sur le catalogue.
+        Le cache est partagé par les chargements de csv en parallèle : ses accès passent par metadata_lock.
+
+        Parameters
+        ----------
+        conn : sqlalchemy.engine.base.Connection
+            Connexion à la base postgres.
+        """
+        columns_df = self.read_columns(conn)
+        tables = set(columns_df["table_name"])
+        with self.metadata_lock:
+            self.schema_cache = {
+                table_name: df.drop(columns="table_name").reset_index(drop=True)
+                for table_name, df in columns_df.groupby("table_name", sort=False)
+            }
+            self.tables_cache = tables
+
+    def update_metadata_cache(self, table_name: str, exists: bool = True):
+        """
+        Met à jour le cache des métadonnées après une modification de la structure d'une table.
+
+        Parameters
+        ----------
+        table_name : str
+            Nom de la table créée, modifiée ou supprimée.
+        exists : bool
+            True si la table existe après la modification, False si elle a été supprimée, by default True.
+        """
+        with self.metadata_lock:
+            if self.tables_cache is not None:
+                if exists:
+                    self.tables_cache.add(table_name)
+                else:
+                    self.tables_cache.discard(table_name)
+            self.schema_cache.pop(table_name, None)
+
+    def prepare(self, conn, name: str, statement: str):
+        """
+        Prépare (PREPARE) une requête une seule fois par connexion postgres : elle est ensuite exécutée par EXECUTE,
+        sans être analysée ni planifiée à nouveau. Les requêtes préparées sont notées dans les infos de la connexion
+        du pool, conservées d'une utilisation à l'autre de cette connexion.
+
+        Parameters
+        ----------
+        conn : sqlalchemy.engine.base.Connection
+            Connexion à la base postgres.
+        name : str
+            Nom de la requête préparée.
+        statement : str
+            Requête à préparer, avec les types de ses paramètres (ex : "(text) AS SELECT ... WHERE x = $1").
+        """
+        prepared = conn.connection.info.setdefault("prepared_statements", set())
+        if name not in prepared:
+            conn.execute(text(f"PREPARE {name} {statement}"))
+            prepared.add(name)
+
     def drop_table(self, conn, query_params: dict):
         """
         Supprime une table et les vues qui lui sont liées.
@@ -74,24 +274,29 @@ class PostgreSQLLoader(DataBasePipeline):
         """
         table_name = query_params['table']
 
-        views = conn.execute(text("""
+        # Recherche des vues liées, préparée une fois par connexion (appelée pour chaque table recréée)
+        self.prepare(conn, "dependent_views", """(text) AS
             SELECT DISTINCT dependent_ns.nspname, dependent_view.relname
             FROM pg_depend
             JOIN pg_rewrite ON pg_depend.objid = pg_rewrite.oid
             JOIN pg_class AS dependent_view ON pg_rewrite.ev_class = dependent_view.oid
             JOIN pg_class AS base_table ON pg_depend.refobjid = base_table.oid
             JOIN pg_namespace AS dependent_ns ON dependent_ns.oid = dependent_view.relnamespace
-            WHERE base_table.relname = :table
-        """), {"table": table_name}).fetchall()
+            WHERE base_table.relname = $1
+        """)
+        views = conn.execute(text("EXECUTE dependent_views(:table)"), {"table": table_name}).fetchall()
 
         for schema, view in views:
             # Suppression des vues liées à la table
             self.logger.info(f"🗑 Vue '{view}' existante → suppression totale (DROP VIEW)")
             conn.execute(text(f'DROP VIEW IF EXISTS "{schema}"."{view}" CASCADE'))
+            if schema == self.schema:
+                self.update_metadata_cache(view, exists=False)
 
         # Suppression de la table
         self.logger.info(f"🗑 Table '{table_name}' existante → suppression totale (DROP TABLE)")
         conn.execute(text(f"DROP TABLE IF EXISTS {table_name} CASCADE"))
+        self.update_metadata_cache(table_name, exists=False)
 
     def create_table(self, conn, sql_query: str, query_params: str):
         """
@@ -108,6 +313,7 @@ class PostgreSQLLoader(DataBasePipeline):
         """
         try:
             conn.execute(text(sql_query))
+            self.update_metadata_cache(query_params["table"])
         except Exception as e:
             self.logger.error(f"❌ Erreur lors de l'exécution : {e}")
             raise
@@ -115,6 +321,7 @@ class PostgreSQLLoader(DataBasePipeline):
     def get_postgres_schema(self, conn, table_name: str) -> pd.DataFrame:
         """
         Récupération du schéma postgres pour une table spécifique.
+        Le schéma est gardé en cache jusqu'à la prochaine modification de la table.
 
         Parameters
         ----------
@@ -128,15 +335,18 @@ class PostgreSQLLoader(DataBasePipeline):
         pd.DataFrame
             Schéma de la table contenant le nom des colonnes, leur type et leur format.
         """
-        inspector = inspect(conn)
-        columns = inspector.get_columns(table_name, schema=self.schema)
-        schema_df = pd.DataFrame(columns)
-        schema_df = schema_df.rename(columns={"name": "column_name", "type": "column_type"})
-        return schema_df
+        with self.metadata_lock:
+            if self.tables_cache is None:
+                self.load_metadata_cache(conn)
+            if table_name not in self.schema_cache:
+                self.schema_cache[table_name] = self.read_columns(conn, table_name).drop(columns="table_name")
+            return self.schema_cache[table_name].copy()
 
     def is_table_exist(self, conn, query_params: dict, print_log: bool = False) -> bool:
         """
         Indique si la table existe ou non.
+        Pour le schéma de la base, les métadonnées sont lues une seule fois (load_metadata_cache),
+        puis tenues à jour par les méthodes qui créent ou suppriment des tables.
 
         Parameters
         ----------
@@ -152,13 +362,19 @@ class PostgreSQLLoader(DataBasePipeline):
         bool
             True si la table existe (et non vide si applicable), False sinon.
         """
-        table_exists = conn.execute(text(
-            """
-            SELECT EXISTS (
-                SELECT FROM information_schema.tables 
-                WHERE table_schema = :schema AND table_name = :table
-            )
-            """), query_params).scalar()
+        if query_params["schema"] == self.schema:
+            with self.metadata_lock:
+                if self.tables_cache is None:
+                    self.load_metadata_cache(conn)
+                table_exists = query_params["table"] in self.tables_cache
+        else:
+            table_exists = conn.execute(text(
+                """
+                SELECT EXISTS (
+                    SELECT FROM information_schema.tables 
+                    WHERE table_schema = :schema AND table_name = :table
+                )
+                """), query_params).scalar()
 
         if table_exists:
             if print_log:
@@ -232,25 +448,52 @@ class PostgreSQLLoader(DataBasePipeline):
                 return
 
             schema_df = self.get_postgres_schema(conn, table_name)
-            # Chargement du csv et datamanagement
+            self.logger.info(f"🆕 Injection dans la table '{table_name}' à partir du CSV {csv_file}")
+
+            # Les tables créées ou supprimées auparavant (create_tables) sont validées avant le chargement :
+            # l'annulation d'une tentative de lecture ne doit défaire que ce chargement
+            if conn.in_transaction():
+                conn.commit()
+
+            # Lecture du csv par COPY, sans passer par pandas
+            trans = conn.begin()
+            try:
+                with self.bulk_load(conn, table_name):
+                    loaded = self.load_csv_native(conn, csv_file, table_name, schema_df)
+                if loaded:
+                    trans.commit()
+                    self.logger.info(f"✅ Table '{table_name}' créée et remplie avec succès ({csv_file})")
+                    return
+                trans.rollback()
+            except Exception as e:
+                trans.rollback()
+                self.logger.warning(f"⚠️ Lecture par COPY impossible pour {csv_file.name} ({e}) → lecture via pandas.")
+
+            # Chargement du csv et datamanagement par blocs de lignes, injectés au fil de la lecture
+            trans = conn.begin()
+            try:
+                rows = 0
+                with self.bulk_load(conn, table_name):
+                    for df in ColumnsManagement.read_chunks(csv_file, schema_df, self.logger):
+                        self.copy_dataframe(conn, table_name, df)
+                        rows += len(df)
+                trans.commit()
+                self.logger.info(f"Taille de '{table_name}' : {rows} lignes")
+                self.logger.info(f"✅ Table '{table_name}' créée et remplie avec succès ({csv_file})")
+                return
+            except Exception as e:
+                trans.rollback()
+                self.logger.warning(f"⚠️ Lecture par blocs impossible pour {csv_file.name} ({e}) → lecture complète du fichier.")
+
+            # Chargement du csv en une fois, avec les délimiteurs alternatifs
             pipeline = ColumnsManagement(csv_file=csv_file, schema_df=schema_df, logger=self.logger)
             df = pipeline.df
             self.logger.info(f"Taille de '{table_name}' : {df.shape}")
 
-            # Création de la table avec la structure du CSV
-            self.logger.info(f"🆕 Injection dans la table '{table_name}' à partir du CSV {csv_file}")
-
-            trans = conn.get_transaction()
+            trans = conn.begin()
             try:
-                df.to_sql(
-                    table_name,
-                    conn,
-                    schema=query_params["schema"],
-                    if_exists="append",
-                    index=False,
-                    method='multi',
-                    chunksize=1000
-                )
+                with self.bulk_load(conn, table_name):
+                    self.copy_dataframe(conn, table_name, df)
                 trans.commit()
             except Exception as e:
                 trans.rollback()
@@ -262,10 +505,222 @@ class PostgreSQLLoader(DataBasePipeline):
         except Exception as e:
             self.logger.error(f"❌ Erreur pour le fichier {csv_file} → {e}")
 
+    def load_csv_files(self, conn, csv_files: list):
+        """
+        Charge les fichiers csv en parallèle, chaque fichier étant chargé par sa propre connexion du pool.
+        Le nombre de chargements simultanés est défini par 'pool_size' (metadata.yml), 4 par défaut.
+
+        Parameters
+        ----------
+        conn : sqlalchemy.engine.base.Connection
+            Connexion à la base de données.
+        csv_files : list
+            Fichiers csv à charger.
+        """
+        # Les tables créées (ou supprimées) par la connexion principale sont validées avant tout chargement :
+        # elles doivent être visibles des autres connexions, et survivre à l'annulation d'un chargement
+        conn.commit()
+        if len(csv_files) < 2 or self.pool_size < 2:
+            return super().load_csv_files(conn, csv_files)
+
+        with self.metadata_lock:
+            if self.tables_cache is None:
+                self.load_metadata_cache(conn)
+
+        def load(csv_file: Path):
+            with self.engine.connect() as worker_conn:
+                self.load_csv_file(worker_conn, csv_file)
+
+        with ThreadPoolExecutor(max_workers=min(self.pool_size, len(csv_files))) as executor:
+            for future in [executor.submit(load, csv_file) for csv_file in csv_files]:
+                future.result()
+
+    @contextmanager
+    def bulk_load(self, conn, table_name: str):
+        """
+        Prépare une table à un chargement massif le temps d'un bloc 'with', dans la transaction en cours :
+        ses index (hors clés primaires et contraintes) sont supprimés puis recréés après le chargement,
+        et les paramètres BULK_LOAD_SETTINGS sont appliqués à la transaction.
+        En cas d'erreur, l'annulation de la transaction rétablit les index.
+
+        Parameters
+        ----------
+        conn : sqlalchemy.engine.base.Connection
+            Connexion à la base postgres.
+        table_name : str
+            Nom de la table chargée.
+        """
+        for name, value in BULK_LOAD_SETTINGS.items():
+            conn.execute(text(f"SET LOCAL {name} = '{value}'"))
+        conn.execute(text("SET CONSTRAINTS ALL DEFERRED"))
+
+        indexes = conn.execute(text("""
+            SELECT index_class.relname, pg_get_indexdef(pg_index.indexrelid)
+            FROM pg_index
+            JOIN pg_class AS index_class ON index_class.oid = pg_index.indexrelid
+            JOIN pg_class AS table_class ON table_class.oid = pg_index.indrelid
+            JOIN pg_namespace AS n ON n.oid = table_class.relnamespace
+            WHERE n.nspname = :schema
+            AND table_class.relname = :table
+            AND NOT EXISTS (SELECT 1 FROM pg_constraint WHERE pg_constraint.conindid = pg_index.indexrelid)
+        """), {"schema": self.schema, "table": table_name}).fetchall()
+        for index_name, _ in indexes:
+            conn.execute(text(f'DROP INDEX "{self.schema}"."{index_name}"'))
+
+        yield
+
+        for _, index_definition in indexes:
+            conn.execute(text(index_definition))
+
+    def load_csv_native(self, conn, csv_file: Path, table_name: str, schema_df: pd.DataFrame) -> bool:
+        """
+        Charge un fichier CSV par COPY dans une table temporaire en texte, puis l'insère dans la table en SQL,
+        sans passer par pandas. Les colonnes sont converties avec les mêmes règles que ColumnsManagement :
+        les colonnes absentes du csv prennent la valeur par défaut de leur type, les colonnes en trop sont ignorées.
+
+        Parameters
+        ----------
+        conn : sqlalchemy.engine.base.Connection
+            Connexion à la base de données.
+        csv_file : Path
+            Fichier csv.
+        table_name : str
+            Nom de la table cible.
+        schema_df : pd.DataFrame
+            Schéma de la table (get_postgres_schema).
+
+        Returns
+        -------
+        bool
+            True si le csv a été chargé, False si son délimiteur n'est pas lisible par COPY (plusieurs octets, ex : '¤').
+        """
+        header = CsvHeader(csv_file, self.logger)
+        if len(header.delimiter.encode("utf-8")) != 1:
+            return False
+        table_columns = schema_df["column_name"].tolist()
+
+        # Même contrôle (et mêmes messages) que ColumnsManagement.check_missing_columns
+        missing_columns = set(table_columns) - set(header.columns)
+        extra_columns = set(header.columns) - set(table_columns)
+        if missing_columns:
+            self.logger.warning(f"Colonnes manquantes dans {csv_file.name} : {missing_columns}")
+        if extra_columns:
+            self.logger.warning(f"Colonnes en trop dans {csv_file.name} : {extra_columns}")
+
+        # Table temporaire (supprimée à la fin de la transaction) recevant le csv brut
+        raw_table = f"csv_{table_name}"
+        raw_columns = ", ".join(f'"{col}" TEXT' for col in header.columns)
+        conn.execute(text(f'CREATE TEMP TABLE "{raw_table}" ({raw_columns}) ON COMMIT DROP'))
+        with open(csv_file, "rb") as f:
+            self.copy_from_csv(conn, raw_table, header.columns, f, delimiter=header.delimiter, header=True, schema="pg_temp")
+
+        # Valeurs considérées comme vides (NULL), comme à la lecture du csv par pandas
+        na_values = ", ".join("'" + value.replace("'", "''") + "'" for value in NA_VALUES)
+        cleaned = ", ".join(
+            f'CASE WHEN "{col}" IN ({na_values}) THEN NULL ELSE "{col}" END AS "{col}"'
+            for col in header.columns
+        )
+        select = ", ".join(
+            self.cast_csv_column("CAST(NULL AS TEXT)" if row["column_name"] in missing_columns else f'"{row["column_name"]}"', str(row["column_type"]))
+            for _, row in schema_df.iterrows()
+        )
+        insert_columns = ", ".join(f'"{col}"' for col in table_columns)
+        conn.execute(text(f"""
+            INSERT INTO "{self.schema}"."{table_name}" ({insert_columns})
+            SELECT {select}
+            FROM (SELECT {cleaned} FROM "pg_temp"."{raw_table}") AS csv
+        """))
+        return True
+
+    def cast_csv_column(self, col: str, column_type: str) -> str:
+        """
+        Expression SQL de conversion d'une colonne csv lue en texte vers le type de la table.
+        Reproduit ColumnsManagement.convert_columns_type (valeurs vides à 0 ou False, dates au format JJ-MM-AAAA...).
+
+        Parameters
+        ----------
+        col : str
+            Expression SQL de la colonne texte (valeurs vides déjà à NULL) : nom protégé de la colonne, ou NULL si elle est absente du csv.
+        column_type : str
+            Type SQL de la colonne dans la table (ex: VARCHAR(50), INTEGER).
+
+        Returns
+        -------
+        str
+            Expression SQL de la colonne convertie.
+        """
+        base_type = re.match(r"^(\w+)", column_type)
+        length = re.search(r"\((\d+)\)", column_type)
+        conversion = TYPE_MAPPING.get(base_type.group(1)) if base_type else None
+
+        if conversion == "int":
+            return f"CAST(TRUNC(CAST(COALESCE({col}, '0') AS DOUBLE PRECISION)) AS BIGINT)"
+        elif conversion == "float":
+            return f"CAST(COALESCE({col}, '0') AS DOUBLE PRECISION)"
+        elif conversion == "bool":
+            return f"(COALESCE({col}, '') <> '')"
+        elif conversion == "datetime64":
+            return f"CASE WHEN {col} ~ '^[0-9]{{1,2}}-[0-9]{{1,2}}-[0-9]{{4}}$' THEN TO_DATE({col}, 'DD-MM-YYYY') END"
+        elif conversion == "string":
+            if length:
+                return f"LEFT(COALESCE({col}, ''), {length.group(1)})"
+            return f"COALESCE({col}, '')"
+        return f"CAST({col} AS {column_type})"
+
+    def copy_dataframe(self, conn, table_name: str, df: pd.DataFrame):
+        """
+        Injecte un dataframe nettoyé (ColumnsManagement) dans une table : il est sérialisé en csv puis injecté par COPY.
+        Les valeurs manquantes sont écrites \\N, pour les distinguer des chaînes vides.
+
+        Parameters
+        ----------
+        conn : sqlalchemy.engine.base.Connection
+            Connexion à la base postgres.
+        table_name : str
+            Nom de la table cible.
+        df : pd.DataFrame
+            Données à injecter, colonnes nommées comme celles de la table.
+        """
+        buffer = StringIO()
+        df.to_csv(buffer, index=False, header=False, na_rep="\\N")
+        buffer.seek(0)
+        self.copy_from_csv(conn, table_name, df.columns.tolist(), buffer)
+
+    def copy_from_csv(self, conn, table_name: str, columns: list, csv_buffer: IO, delimiter: str = ",", header: bool = False, schema: str = None):
+        """
+        Injecte un flux csv dans une table avec COPY ... FROM STDIN (curseur psycopg2 de la connexion).
+        Les valeurs \\N sont lues comme NULL, les chaînes vides restent des chaînes vides.
+
+        Parameters
+        ----------
+        conn : sqlalchemy.engine.base.Connection
+            Connexion à la base postgres.
+        table_name : str
+            Nom de la table cible.
+        columns : list
+            Colonnes de la table alimentées, dans l'ordre du csv.
+        csv_buffer : IO
+            Flux csv (fichier ouvert ou buffer mémoire).
+        delimiter : str, optional
+            Délimiteur du csv, by default ",".
+        header : bool, optional
+            True si la première ligne du flux est un en-tête à ignorer, by default False.
+        schema : str, optional
+            Schéma de la table, celui de la base si None (pg_temp pour une table temporaire), None by default.
+        """
+        cols = ", ".join(f'"{col}"' for col in columns)
+        delimiter = delimiter.replace("'", "''")
+        query = f"""
+            COPY "{schema or self.schema}"."{table_name}" ({cols})
+            FROM STDIN WITH (FORMAT csv, DELIMITER '{delimiter}', HEADER {str(header).upper()}, NULL '\\N')
+        """
+        with conn.connection.cursor() as cursor:
+            cursor.copy_expert(query, csv_buffer)
+
     def fetch_df(self, conn, table_name: str) -> pd.DataFrame:
         """
-        Fonction de chargement d'une table depuis une base postgres.
-        Importante pour l'export des csv.
+        Fonction de chargement d'une table du schéma de la base postgres.
+        Utilisée par l'export csv par défaut (export_table_to_csv de DataBasePipeline) ; sans effet sur la session.
 
         Parameters
         ----------
@@ -279,13 +734,71 @@ class PostgreSQLLoader(DataBasePipeline):
         pd.DataFrame
             Dataframe de la table chargée.
         """
-        conn.execute(text(f"SET search_path TO {self.schema}"))
-        conn.commit()
-        return pd.read_sql_table(table_name, conn)
+        return pd.read_sql_table(table_name, conn, schema=self.schema)
+
+    def export_views(self, conn, views: list, date: str):
+        """
+        Exporte les vues au format csv en parallèle, chaque vue étant exportée par sa propre connexion du pool.
+        Le nombre d'exports simultanés est défini par 'pool_size' (metadata.yml), 4 par défaut.
+
+        Parameters
+        ----------
+        conn : sqlalchemy.engine.base.Connection
+            Connexion à la base de données.
+        views : list
+            Couples (nom de la vue, nom du fichier csv) à exporter.
+        date : str
+            Date présente dans le nom des fichiers à exporter.
+        """
+        if len(views) < 2 or self.pool_size < 2:
+            return super().export_views(conn, views, date)
+
+        def export(view: tuple):
+            table_name, csv_name = view
+            with self.engine.connect() as worker_conn:
+                transfo = TableInCsv(worker_conn, table_name, csv_name, self.export_table_to_csv, self.csv_folder_output, self.logger)
+                transfo.export_to_csv(date=date)
+
+        with ThreadPoolExecutor(max_workers=min(self.pool_size, len(views))) as executor:
+            for future in [executor.submit(export, view) for view in views]:
+                future.result()
+
+    def export_table_to_csv(self, conn, table_name: str, path: str):
+        """
+        Écrit une table dans un fichier csv avec COPY ... TO STDOUT, sans passer par pandas.
+        Le fichier garde le format des exports : en-tête, séparateur ';', encodage utf-8-sig (BOM)
+        et valeurs écrites comme par pandas (export_csv_column), identiques à celles de l'export DuckDB.
+
+        Parameters
+        ----------
+        conn : sqlalchemy.engine.base.Connection
+            Connexion à la base de données.
+        table_name : str
+            Nom de la table à écrire.
+        path : str
+            Chemin du fichier csv.
+        """
+        # Colonnes lues dans le catalogue (les vues créées par dbt ne sont pas dans le cache des métadonnées)
+        columns = self.read_columns(conn, table_name)
+        select = ", ".join(
+            f"{self.export_csv_column(col, column_type)} AS {col}"
+            for col, column_type in zip('"' + columns["column_name"] + '"', columns["column_type"])
+        )
+        query = f"""
+            COPY (SELECT {select} FROM {self.qualified_name(table_name)})
+            TO STDOUT WITH (FORMAT csv, HEADER TRUE, DELIMITER ';', ENCODING 'UTF8')
+        """
+        with open(path, "wb") as f, conn.connection.cursor() as cursor:
+            # COPY n'écrit pas de BOM : il est ajouté en tête du fichier
+            f.write(codecs.BOM_UTF8)
+            cursor.copy_expert(query, f)
 
     def copy_table_from_staging(self, conn, staging_table_name: str, db_table_name: str):
         """
         Copie d'une table de la base Staging vers la base cible.
+        La table copiée est UNLOGGED (hors journal WAL) : elle est recopiée à chaque exécution depuis la base Staging.
+        Si les deux bases sont la même base postgres (même utilisateur), la copie est faite entièrement par le serveur (INSERT ... SELECT),
+        sinon les données passent d'une base à l'autre au format binaire de COPY.
 
         Parameters
         ----------
@@ -296,37 +809,74 @@ class PostgreSQLLoader(DataBasePipeline):
         """
         staging_db_config = self.staging_db_config
         if staging_db_config:
-            # Connexion aux deux bases
-            engine_source = self.init_engine(
-                staging_db_config["user"],
-                urllib.parse.quote(resolve_env_var(staging_db_config["password"])),
-                staging_db_config["host"],
-                staging_db_config["port"],
-                staging_db_config["dbname"]
-                )
-            engine_target = self.engine
-
-            # Copier de la base Staging
-            df = pd.read_sql(f"SELECT * FROM {staging_table_name}", engine_source)
-
-            # Coller dans la base cible (suppression de la table avant)
-            query_params = {"schema": self.schema, "table": db_table_name}
-            trans = conn.begin()
-
-            try:
-                if self.is_table_exist(conn, query_params):
-                    self.drop_table(conn, query_params)
-                trans.commit()
-                
-                df.to_sql(db_table_name, engine_target, if_exists='replace', index=False, schema=self.schema)
-                self.logger.info(f"✅ La table {staging_table_name} a bien été récupérée de la base {staging_db_config["dbname"]} vers la base {self.db_name} sous le nom {db_table_name}.")
-            except Exception as e:
-                trans.rollback()
-                self.logger.error(f"❌ Erreur lors de l'exécution : {e}")
-                raise
+            target = f'"{self.schema}"."{db_table_name}"'
+            same_base = all(str(staging_db_config[key]) == str(self.db_config[key]) for key in ("host", "port", "dbname", "user"))
+
+            if same_base:
+                # Copie dans la même base : la structure est reprise de la table Staging (LIKE)
+                staging_schema = staging_db_config.get("schema")
+                source = f'"{staging_schema}"."{staging_table_name}"' if staging_schema else staging_table_name
+                with self.replace_table(conn, db_table_name):
+                    conn.execute(text(f"CREATE UNLOGGED TABLE {target} (LIKE {source})"))
+                    conn.execute(text(f"INSERT INTO {target} SELECT * FROM {source}"))
+            else:
+                # Connexion à la base Staging
+                engine_source = self.init_engine(staging_db_config)
+
+                # Copier de la base Staging : structure de la table puis données au format binaire de COPY
+                # (les données transitent par un fichier temporaire, en mémoire tant qu'il reste petit)
+                with engine_source.connect() as conn_source, SpooledTemporaryFile(max_size=COPY_SPOOL_SIZE) as data:
+                    columns = conn_source.execute(text("""
+                        SELECT attname, format_type(atttypid, atttypmod)
+                        FROM pg_attribute
+                        WHERE attrelid = CAST(:table AS regclass) AND attnum > 0 AND NOT attisdropped
+                        ORDER BY attnum
+                    """), {"table": staging_table_name}).fetchall()
+                    with conn_source.connection.cursor() as cursor:
+                        cursor.copy_expert(f"COPY (SELECT * FROM {staging_table_name}) TO STDOUT WITH (FORMAT binary)", data)
+                    data.seek(0)
+
+                    # Coller dans la base cible
+                    with self.replace_table(conn, db_table_name):
+                        columns_definition = ", ".join(f'"{name}" {column_type}' for name, column_type in columns)
+                        conn.execute(text(f"CREATE UNLOGGED TABLE {target} ({columns_definition})"))
+                        with conn.connection.cursor() as cursor:
+                            cursor.copy_expert(f"COPY {target} FROM STDIN WITH (FORMAT binary)", data)
+
+            self.logger.info(f"✅ La table {staging_table_name} a bien été récupérée de la base {staging_db_config['dbname']} vers la base {self.db_name} sous le nom {db_table_name}.")
         else:
             self.logger.error("❌ La configuration de la base Staging n'a pas été indiquée.")
 
+    @contextmanager
+    def replace_table(self, conn, table_name: str):
+        """
+        Remplace une table le temps d'un bloc 'with' : la table existante (et ses vues) est supprimée,
+        le bloc la recrée et la remplit, le tout dans une seule transaction (sans attendre l'écriture du journal au commit).
+
+        Parameters
+        ----------
+        conn : sqlalchemy.engine.base.Connection
+            Connexion à la base postgres.
+        table_name : str
+            Nom de la table remplacée.
+        """
+        query_params = {"schema": self.schema, "table": table_name}
+        trans = conn.get_transaction() or conn.begin()
+        try:
+            # Une seule exécution à la fois remplace la table (verrou libéré à la fin de la transaction)
+            conn.execute(text("SELECT pg_advisory_xact_lock(hashtext(:name))"), {"name": f"{self.schema}.{table_name}"})
+            conn.execute(text("SET LOCAL synchronous_commit = 'off'"))
+            if self.is_table_exist(conn, query_params):
+                self.drop_table(conn, query_params)
+            yield
+            self.update_metadata_cache(table_name)
+            trans.commit()
+        except Exception as e:
+            trans.rollback()
+            self.reset_metadata_cache()
+            self.logger.error(f"❌ Erreur lors de l'exécution : {e}")
+            raise
+
     def copy_table_into_new(self, conn, source: str, target: str):
         """
         Copie une table dans une nouvelle.
@@ -341,9 +891,10 @@ class PostgreSQLLoader(DataBasePipeline):
             Nom de la table à laquelle on ajoute les données de la première. 
 
         """
-        query = text(f"CREATE TABLE {target} AS TABLE {source} WITH DATA")
+        query = text(f"CREATE TABLE {self.qualified_name(target)} AS TABLE {self.qualified_name(source)} WITH DATA")
         conn.execute(query)
         conn.commit()
+        self.update_metadata_cache(target)
         self.logger.info(f"✅ Table historique {target} créée à partir de {source}")
 
     def append_table(self, conn, source: str, target: str):
@@ -361,21 +912,9 @@ class PostgreSQLLoader(DataBasePipeline):
             Nom de la table à laquelle on ajoute les données de la première. 
 
         """
-        # Récupérer les colonnes de la table source
-        source_cols = [row[0] for row in conn.execute(text(f"""
-            SELECT column_name
-            FROM information_schema.columns
-            WHERE table_name = :source
-            ORDER BY ordinal_position
-        """), {"source": source}).fetchall()]
-
-        # Récupérer les colonnes de la table target
-        target_cols = [row[0] for row in conn.execute(text(f"""
-            SELECT column_name
-            FROM information_schema.columns
-            WHERE table_name = :target
-            ORDER BY ordinal_position
-        """), {"target": target}).fetchall()]
+        # Récupérer les colonnes des deux tables
+        source_cols = self.get_postgres_schema(conn, source)["column_name"].tolist()
+        target_cols = self.get_postgres_schema(conn, target)["column_name"].tolist()
 
         # Colonnes en commun
         common_cols = [col for col in source_cols if col in target_cols]
@@ -383,13 +922,88 @@ class PostgreSQLLoader(DataBasePipeline):
         cols_str = ", ".join([f'"{col}"' for col in common_cols])  # protéger les noms de colonnes
 
         query = text(f"""
-            INSERT INTO {target} ({cols_str})
-            SELECT {cols_str} FROM {source}
+            INSERT INTO {self.qualified_name(target)} ({cols_str})
+            SELECT {cols_str} FROM {self.qualified_name(source)}
         """)
         conn.execute(query)
         conn.commit()
         self.logger.info(f"✅ Données de {source} ajoutées à {target}")
 
+    def historise_tables(self, conn, tables: list):
+        """
+        Historise les données de plusieurs tables : copie de chaque table dans sa ztable,
+        puis ajout de la date du jour dans toutes les ztables en une seule fois (add_current_date_many).
+
+        Parameters
+        ----------
+        conn : sqlalchemy.engine.base.Connection
+            Connexion à la base de données.
+        tables : list
+            Noms des tables à historiser.
+        """
+        try:
+            for table_name in tables:
+                table_name_histo = f"z{table_name}"
+                if not self.is_table_exist(conn, {"schema": self.schema, "table": table_name_histo}):
+                    self.copy_table_into_new(conn, table_name, table_name_histo)
+                else:
+                    self.append_table(conn, table_name, table_name_histo)
+
+            # Ajout de la date du jour dans les tables historiques
+            self.add_current_date_many(conn, [f"z{table_name}" for table_name in tables], "date_ingestion")
+        except Exception as e:
+            self.logger.error(f"❌ Erreur lors de l'historisation : {e}")
+            raise
+
+        for table_name in tables:
+            self.logger.info(f"✅ Données de {table_name} historisées avec succès dans z{table_name}")
+
+    def add_current_date_many(self, conn, tables: list, column_name: str):
+        """
+        Ajoute la date du jour (date d'historisation) à plusieurs tables, en une seule requête et une seule transaction :
+        création de la colonne si elle n'existe pas encore, puis remplissage des lignes sans date.
+
+        Parameters
+        ----------
+        conn : sqlalchemy.engine.base.Connection
+            Connexion à la base postgres.
+        tables : list
+            Noms des tables.
+        column_name : str
+            Nom de la colonne date.
+        """
+        if not tables:
+            return
+
+        # Colonne à créer seulement pour les tables qui ne l'ont pas encore (cache des métadonnées)
+        new_columns = [
+            table_name for table_name in tables
+            if column_name not in self.get_postgres_schema(conn, table_name)["column_name"].values
+        ]
+        statements = [
+            f'ALTER TABLE {self.qualified_name(table_name)} ADD COLUMN IF NOT EXISTS "{column_name}" TIMESTAMP'
+            for table_name in new_columns
+        ]
+        statements += [
+            f"""UPDATE {self.qualified_name(table_name)}
+            SET "{column_name}" = CURRENT_TIMESTAMP AT TIME ZONE '{TIMEZONE}'
+            WHERE "{column_name}" IS NULL"""
+            for table_name in tables
+        ]
+
+        try:
+            conn.execute(text(";\n".join(statements)))
+            conn.commit()
+        except Exception:
+            conn.rollback()
+            raise
+        finally:
+            for table_name in new_columns:
+                self.update_metadata_cache(table_name)
+
+        for table_name in new_columns:
+            self.logger.info(f"Colonne {column_name} créée dans la table {table_name}")
+
     def add_current_date(self, conn, table_name: str, column_name: str):
         """
         Ajoute la date du jour (date d'historisation) à une table.
@@ -403,19 +1017,14 @@ class PostgreSQLLoader(DataBasePipeline):
         column_name : str
             Nom de la colonne date.
         """
-        tz = "Europe/Paris"
-        
+        tz = TIMEZONE
+
         # Vérifier que la colonne existe
-        check_query = text(f"""
-            SELECT column_name
-            FROM information_schema.columns
-            WHERE table_name = '{table_name}'
-            AND column_name = '{column_name}'
-        """)
-        column_exists = conn.execute(check_query).fetchone()
+        column_exists = column_name in self.get_postgres_schema(conn, table_name)["column_name"].values
 
         if not column_exists:
             conn.execute(text(f'ALTER TABLE "{table_name}" ADD COLUMN {column_name} TIMESTAMP'))
+            self.update_metadata_cache(table_name)
             self.logger.info(f"Colonne {column_name} créée dans la table {table_name}")
         
         conn.execute(text(f'''
@@ -440,6 +1049,7 @@ class PostgreSQLLoader(DataBasePipeline):
         """
         query = text(f'ALTER TABLE "{table_name}" DROP COLUMN "{column_name}"')
         conn.execute(query)
+        self.update_metadata_cache(table_name)
 
     def truncate_table(self, conn, table_name: str):
         """
@@ -470,30 +1080,59 @@ class PostgreSQLLoader(DataBasePipeline):
         conn = self.conn
         schema = self.schema
 
-        # Récupération des tables
+        # Récupération des tables et des vues qui en dépendent, en une seule requête
         query = text("""
-            SELECT table_name
-            FROM information_schema.tables
-            WHERE table_schema = :schema
-            AND table_name LIKE 'z%';
+            WITH histo AS (
+                SELECT c.oid, c.relname
+                FROM pg_class AS c
+                JOIN pg_namespace AS n ON n.oid = c.relnamespace
+                WHERE n.nspname = :schema
+                AND c.relkind IN ('r', 'p')
+                AND c.relname LIKE 'z%'
+            ),
+            dependent_views AS (
+                SELECT DISTINCT pg_depend.refobjid, dependent_ns.nspname, dependent_view.relname
+                FROM pg_depend
+                JOIN pg_rewrite ON pg_depend.objid = pg_rewrite.oid
+                JOIN pg_class AS dependent_view ON pg_rewrite.ev_class = dependent_view.oid
+                JOIN pg_namespace AS dependent_ns ON dependent_ns.oid = dependent_view.relnamespace
+                WHERE pg_depend.refobjid IN (SELECT oid FROM histo)
+            )
+            SELECT histo.relname, dependent_views.nspname, dependent_views.relname
+            FROM histo
+            LEFT JOIN dependent_views ON dependent_views.refobjid = histo.oid
+            ORDER BY histo.relname
         """)
-        tables = [row[0] for row in conn.execute(query, {"schema": schema}).fetchall()]
+        rows = conn.execute(query, {"schema": schema}).fetchall()
 
-        if not tables:
+        if not rows:
             self.logger.info(f"Aucune table 'z%' trouvée dans le schéma {schema}")
             return
 
-        # Suppression des tables
+        tables = list(dict.fromkeys(table for table, _, _ in rows))
+        views = list(dict.fromkeys((view_schema, view) for _, view_schema, view in rows if view))
+
+        # Suppression des vues puis des tables, en une seule instruction et une seule transaction
+        statements = []
+        if views:
+            statements.append("DROP VIEW IF EXISTS " + ", ".join(f'"{view_schema}"."{view}"' for view_schema, view in views) + " CASCADE")
+        statements.append("DROP TABLE IF EXISTS " + ", ".join(f'"{schema}"."{table}"' for table in tables) + " CASCADE")
+
         try:
-            for table in tables:
-                query_params = {"schema": schema, "table": table}
-                self.drop_table(conn, query_params)
-                self.logger.info(f"✅ Table {schema}.{table} supprimée")
+            conn.execute(text(";\n".join(statements)))
             conn.commit()
         except Exception as e:
+            conn.rollback()
+            self.reset_metadata_cache()
             self.logger.error(f"❌ Erreur lors de la réinitialisation de l'historique : {e}")
             raise
 
+        self.reset_metadata_cache()
+        for view_schema, view in views:
+            self.logger.info(f"🗑 Vue {view_schema}.{view} supprimée")
+        for table in tables:
+            self.logger.info(f"✅ Table {schema}.{table} supprimée")
+
     def close(self):
         """Ferme la connexion à la base de données postgres."""
         self.conn.close()
@@ -18,8 +18,8 @@ def main(config_var: dict):
     ----------
     config_var : dict
         Dictionnaire contenant les configurations nécessaires à l'utilisation de la pipeline :
-            - liste des environnements possibles (env_choice)
-            - liste des projets existants (profile_choice)
+            - environnements possibles (env_choice)
+            - projets existants (profile_choice)
             - environnement (env)
             - profile (profile)
             - fichier de log (logger)
@@ -2,22 +2,41 @@
 from logging import Logger
 import os
 import os.path
+from concurrent.futures import ThreadPoolExecutor
 
 # === Modules ===
-from pipeline.utils.sftp_sync import SFTPSync
+# PostgreSQLLoader (sqlalchemy, psycopg2) et SFTPSync (paramiko) ne sont importés que par les pipelines 'anais'
 from pipeline.database_management.duckdb_pipeline import DuckDBPipeline
-from pipeline.database_management.postgres_loader import PostgreSQLLoader
 from pipeline.utils.dbt_tools import dbt_exec
 
 # === Fonctions ===
+def is_dir_not_empty(path: str) -> bool:
+    """
+    Vérifie qu'un répertoire contient au moins un élément, sans lister tout son contenu.
+
+    Parameters
+    ----------
+    path : str
+        Répertoire à vérifier.
+
+    Returns
+    -------
+    bool
+        True si le répertoire n'est pas vide.
+    """
+    with os.scandir(path) as entries:
+        return next(entries, None) is not None
+
+
 def anais_staging_pipeline(profile: str, config: dict, db_config: dict, logger: Logger):
     """
     Pipeline exécuter pour Staging sur anais.
     Etapes:
-        1. Récupération des fichiers d'input csv depuis le SFTP
+        1. Récupération des fichiers d'input csv depuis le SFTP, pendant les étapes 2 et 3
         2. Connexion à la base Postgres Staging
-        3. Création des tables et injection des données
-        4. Création des vues via DBT
+        3. Création des tables
+        4. Injection des données, une fois les fichiers récupérés
+        5. Création des vues via DBT
 
     Parameters
     ----------
@@ -30,24 +49,28 @@ def anais_staging_pipeline(profile: str, config: dict, db_config: dict, logger:
     logger : Logger
         Fichier de log.
     """
+    from pipeline.database_management.postgres_loader import PostgreSQLLoader
+    from pipeline.utils.sftp_sync import SFTPSync
+
     # Initialisation de la config postgres
     pg_loader = PostgreSQLLoader(
         db_config=db_config,
         config=config,
         logger=logger)
 
-    # Récupération des fichiers sur le sftp
+    # Récupération des fichiers sur le sftp, en tâche de fond
     sftp = SFTPSync(config["local_directory_input"], logger)
-    sftp.download_all(config["files_to_download"])
+    with ThreadPoolExecutor(max_workers=1) as executor:
+        download = executor.submit(sftp.download_all, config["files_to_download"])
 
-    # Remplissage des tables de la base postgres
-    pg_loader.connect()
-    pg_loader.run()
-    pg_loader.close()
+        # Remplissage des tables de la base postgres : création des tables pendant le téléchargement
+        with pg_loader.session():
+            pg_loader.create_tables()
+            download.result()
+            pg_loader.run(create_tables=False)
 
     # Création des vues et export
-    dbt_exec("run", profile, "anais", config["models_directory"], ".", logger, install_deps=False)
-    dbt_exec("test", profile, "anais", config["models_directory"], ".", logger)
+    dbt_exec("build", profile, "anais", config["models_directory"], ".", logger)
 
 
 def local_staging_pipeline(profile: str, config: dict, db_config: dict, logger: Logger):
@@ -79,7 +102,7 @@ def local_staging_pipeline(profile: str, config: dict, db_config: dict, logger:
     loader.connect()
     try:
         # Si la base duckDB Staging existe
-        if os.listdir(config["local_directory_input"]) and os.listdir(config["create_table_directory"]):
+        if is_dir_not_empty(config["local_directory_input"]) and is_dir_not_empty(config["create_table_directory"]):
             loader.run()
             
         else:
@@ -96,10 +119,9 @@ def local_staging_pipeline(profile: str, config: dict, db_config: dict, logger:
     # Vérifie si la base DuckDB est vide ou non avant de lancer le run dbt
     if not duckdb_empty:
         # Création des vues et export
-        dbt_exec("run", profile, "local", config["models_directory"], ".", logger, install_deps=False)
-        dbt_exec("test", profile, "anais", config["models_directory"], ".", logger)
+        dbt_exec("build", profile, "local", config["models_directory"], ".", logger)
     else:
-        logger.error(f"❌ Base {db_config["path"]} vide ")
+        logger.error(f"❌ Base {db_config['path']} vide ")
 
 
 def anais_project_pipeline(profile: str, config: dict, db_config: dict, staging_db_config: dict, today: str, logger: Logger):
@@ -129,6 +151,9 @@ def anais_project_pipeline(profile: str, config: dict, db_config: dict, staging_
     logger : Logger
         Fichier de log.
     """
+    from pipeline.database_management.postgres_loader import PostgreSQLLoader
+    from pipeline.utils.sftp_sync import SFTPSync
+
     # --- Projet ---
     # Initialisation de la config postgres
     pg_loader = PostgreSQLLoader(
@@ -137,24 +162,22 @@ def anais_project_pipeline(profile: str, config: dict, db_config: dict, staging_
         logger=logger,
         staging_db_config=staging_db_config)
 
-    # # Remplissage des tables de la base postgres
-    pg_loader.connect()
-    pg_loader.copy_table(config["table_to_copy"])
+    with pg_loader.session():
+        # # Remplissage des tables de la base postgres
+        pg_loader.copy_table(config["table_to_copy"])
 
-    # Création des vues et export
-    dbt_exec("run", profile, "anais", config["models_directory"], ".", logger)
-    dbt_exec("test", profile, "anais", config["models_directory"], ".", logger)
+        # Création des vues et export
+        dbt_exec("build", profile, "anais", config["models_directory"], ".", logger)
 
-    # Upload les tables qui servent à la création des vues
-    sftp = SFTPSync(config["local_directory_input"], logger)
+        # Upload les tables qui servent à la création des vues
+        sftp = SFTPSync(config["local_directory_input"], logger)
 
-    # pg_loader.export_csv(config["input_to_download"], date=today)
-    # sftp.upload_file_to_sftp(config["input_to_download"], config["local_directory_output"], config["remote_directory_input"], date=today)
+        # pg_loader.export_csv(config["input_to_download"], date=today)
+        # sftp.upload_file_to_sftp(config["input_to_download"], config["local_directory_output"], config["remote_directory_input"], date=today)
 
-    # Upload les vues
-    pg_loader.export_csv(config["files_to_upload"], date=today)
-    sftp.upload_file_to_sftp(config["files_to_upload"], config["local_directory_output"], config["remote_directory_output"], date=today)
-    pg_loader.close()
+        # Upload les vues
+        pg_loader.export_csv(config["files_to_upload"], date=today)
+        sftp.upload_file_to_sftp(config["files_to_upload"], config["local_directory_output"], config["remote_directory_output"], date=today)
 
 
 def local_project_pipeline(profile: str, config: dict, db_config: dict, staging_db_config: dict, today: str, logger: Logger):
@@ -200,7 +223,7 @@ def local_project_pipeline(profile: str, config: dict, db_config: dict, staging_
         if os.path.isfile(staging_db_config["path"]):
             ddb_loader.copy_table(config["table_to_copy"])
 
-        elif os.listdir(config["local_directory_input"]) and os.listdir(config["create_table_directory"]):
+        elif is_dir_not_empty(config["local_directory_input"]) and is_dir_not_empty(config["create_table_directory"]):
             ddb_loader.run()
         else:
             logger.error(
@@ -217,13 +240,12 @@ def local_project_pipeline(profile: str, config: dict, db_config: dict, staging_
     # Vérifie si la base DuckDB est vide ou non avant de lancer le run dbt
     if not duckdb_empty:
         # Création des vues et export
-        dbt_exec("run", profile, "local", config["models_directory"], ".", logger)
-        dbt_exec("test", profile, "local", config["models_directory"], ".", logger)
+        dbt_exec("build", profile, "local", config["models_directory"], ".", logger)
 
-        # Upload les vues
-        ddb_loader.connect()
+        # Upload les vues (lecture seule : la base n'est plus modifiée après le run dbt)
+        ddb_loader.connect(read_only=True)
         # ddb_loader.export_csv(config["input_to_download"], date=today)
         ddb_loader.export_csv(config["files_to_upload"], date=today)
         ddb_loader.close()
     else:
-        logger.error(f"❌ Base {db_config["path"]} vide ")
\ No newline at end of file
+        logger.error(f"❌ Base {db_config['path']} vide ")
\ No newline at end of file
@@ -1,6 +1,7 @@
 # === Packages ===
 from dotenv import load_dotenv
 import argparse
+import functools
 from datetime import date
 
 # === Modules ===
@@ -8,13 +9,50 @@ from pipeline.utils.load_yml import load_metadata_YAML
 from pipeline.utils.logging_management import setup_logger
 
 # === Constantes ===
-load_dotenv()
-ENV_CHOICE = ["local", "anais"]
-PROFILE_CHOICE = ["Staging", "CertDC", "Helios", "InspectionControlePA", "InspectionControlePH", "MatricePreciblage"]
+ENV_CHOICE = ("local", "anais")
+PROFILE_CHOICE = ("Staging", "CertDC", "Helios", "InspectionControlePA", "InspectionControlePH", "MatricePreciblage")
 METADATA_YML = "metadata.yml"
 PROFILE_YML = "profiles.yml"
+# Arguments de lancement de la pipeline
+PARSER = argparse.ArgumentParser(description="Exécution du pipeline")
+PARSER.add_argument("--env", choices=ENV_CHOICE, default=ENV_CHOICE[0], help="Environnement d'exécution")
+PARSER.add_argument("--profile", choices=PROFILE_CHOICE, default=PROFILE_CHOICE[0], help="Profile dbt d'exécution")
 
 # === Fonctions ===
+def ensure_env():
+    """
+    Charge les variables d'environnement du fichier .env (identifiants des bases, du SFTP...).
+    Appelée au lancement de la pipeline plutôt qu'à l'import des modules ; les variables déjà définies ne sont pas écrasées.
+    """
+    load_dotenv()
+
+
+@functools.lru_cache(maxsize=None)
+def today() -> str:
+    """
+    Date du jour au format YYYY_MM_DD (nommage des fichiers exportés), calculée une seule fois par exécution.
+
+    Returns
+    -------
+    str
+        Date du jour.
+    """
+    return date.today().strftime("%Y_%m_%d")
+
+
+@functools.lru_cache(maxsize=1)
+def parse_args() -> argparse.Namespace:
+    """
+    Lecture des arguments de la ligne de commande, une seule fois par exécution.
+
+    Returns
+    -------
+    argparse.Namespace
+        Arguments env et profile.
+    """
+    return PARSER.parse_args()
+
+
 def env_var() -> dict:
     """
     Configuration des variables d'environnement nécessaires lors du lancement de la pipeline (ou d'un morceau).
@@ -26,10 +64,7 @@ def env_var() -> dict:
     dict
         Dictionnaire contenant les clés env et profile, associé à leurs valeurs respectives.
     """
-    parser = argparse.ArgumentParser(description="Exécution du pipeline")
-    parser.add_argument("--env", choices=ENV_CHOICE, default=ENV_CHOICE[0], help="Environnement d'exécution")
-    parser.add_argument("--profile", choices=PROFILE_CHOICE, default=PROFILE_CHOICE[0], help="Profile dbt d'exécution")
-    args = parser.parse_args()
+    args = parse_args()
     env = args.env
     profile = args.profile
 
@@ -61,6 +96,7 @@ def setup_config(config_var: dict, metadata_yml: str = METADATA_YML, profile_yml
     dict
         Dictionnaire contenant les clés env, profile, logger, config, associé à leurs valeurs respectives.
     """
+    ensure_env()
     env = config_var.get("env")
     profile = config_var.get("profile")
 
@@ -69,13 +105,12 @@ def setup_config(config_var: dict, metadata_yml: str = METADATA_YML, profile_yml
     config = load_metadata_YAML(metadata_yml, profile, logger, ".")
     db_config = load_metadata_YAML(profile_yml, profile, logger, ".")["outputs"][env]
     staging_db_config = load_metadata_YAML(profile_yml, "Staging", logger, ".")["outputs"][env]
-    today = date.strftime(date.today(), "%Y_%m_%d")
 
     config_var["logger"] = logger
     config_var["config"] = config
     config_var["db_config"] = db_config
     config_var["staging_db_config"] = staging_db_config
-    config_var["today"] = today
+    config_var["today"] = today()
     
 
     return config_var
@@ -1,15 +1,41 @@
 # === Packages ===
 import pandas as pd
+import pyarrow as pa
+import pyarrow.csv as pa_csv
 import csv
 import os
 from io import StringIO
 import re
 import unicodedata
-from collections.abc import Callable
+from collections.abc import Callable, Iterable, Iterator
+from typing import Any
 from pathlib import Path
 from logging import Logger
 
 
+# === Constantes ===
+# Correspondance entre le type SQL d'une colonne et sa conversion
+TYPE_MAPPING = {
+    "INTEGER": "int",
+    "BIGINT": "int",
+    "FLOAT": "float",
+    "DOUBLE": "float",
+    "REAL": "float",
+    "TEXT": "string",
+    "VARCHAR": "string",
+    "BOOLEAN": "bool",
+    "DATE": "datetime64",
+    "TIMESTAMP": "datetime64",
+}
+# Valeurs considérées comme vides par pandas.read_csv (valeurs par défaut de pandas)
+NA_VALUES = [
+    "", "#N/A", "#N/A N/A", "#NA", "-1.#IND", "-1.#QNAN", "-NaN", "-nan", "1.#IND", "1.#QNAN",
+    "<NA>", "N/A", "NA", "NULL", "NaN", "None", "n/a", "nan", "null"
+]
+# Taille (en octets) des blocs lus à la fois lors d'une lecture du csv par blocs
+CSV_BLOCK_SIZE = 64 * 1024 * 1024
+
+
 # === Classes ===
 class TransformExcel:
     def __init__(self, local_xlsx_path: str, local_csv_path: str, logger: Logger):
@@ -248,9 +274,77 @@ class StandardizeColnames:
 
         self.df.columns = new_columns
 
+    def resolve_duplicate_columns(self):
+        """
+        Modifie les noms de colonnes en cas de doublon dans le DataFrame
+        en ajoutant un suffixe numérique (ex: 'col', 'col_1', 'col_2', ...),
+        tout en respectant la limite de 63 caractères pour les noms de colonnes.
+        """
+        MAX_LENGTH = 63
+        new_columns = []
+        seen = {}
+
+        for col in self.df.columns:
+            base_col = col
+            count = seen.get(col, 0)
+
+            if count == 0 and col not in new_columns:
+                seen[col] = 1
+                new_columns.append(col)
+            else:
+                # Génère un nom unique avec suffixe, en tenant compte de la longueur
+                while True:
+                    suffix = f"_{seen.get(base_col, 1)}"
+                    max_base_len = MAX_LENGTH - len(suffix)
+                    truncated_base = base_col[:max_base_len]
+                    new_col = f"{truncated_base}{suffix}"
+
+                    if new_col not in seen and new_col not in new_columns:
+                        break
+                    seen[base_col] = seen.get(base_col, 1) + 1
+
+                seen[new_col] = 1
+                seen[base_col] = seen.get(base_col, 1) + 1
+                new_columns.append(new_col)
+
+        self.df.columns = new_columns
+
+
+class CsvHeader(StandardizeColnames):
+    def __init__(self, csv_file: Path, logger: Logger):
+        """
+        Classe de lecture de l'en-tête d'un csv, sans charger les données.
+        Les noms de colonnes sont standardisés comme dans ColumnsManagement.
+
+        Parameters
+        ----------
+        csv_file : Path
+            Fichier csv à lire.
+        logger : logging.Logger
+            Fichier de log.
+        """
+        self.csv_file = csv_file
+        self.delimiter = ReadCsvWithDelimiter(csv_file, logger).dialect
+        super().__init__(pd.DataFrame(columns=self.read_header()), logger)
+        self.standardize_column_names()
+        self.resolve_duplicate_columns()
+        self.columns = self.df.columns.tolist()
+
+    def read_header(self) -> list:
+        """
+        Lit la première ligne du csv.
+
+        Returns
+        -------
+        list
+            Noms des colonnes du csv, tels qu'écrits dans le fichier.
+        """
+        with open(self.csv_file, "r", encoding="utf-8-sig", newline="") as f:
+            return next(csv.reader(f, delimiter=self.delimiter, quotechar='"'), [])
+
 
 class ColumnsManagement(StandardizeColnames):
-    def __init__(self, csv_file: Path, schema_df: pd.DataFrame, logger: Logger):
+    def __init__(self, csv_file: Path, schema_df: pd.DataFrame, logger: Logger, df: pd.DataFrame = None, verbose: bool = True):
         """
         Initialisation de la base DuckDB. Classe héritière de DataBasePipeline.
 
@@ -262,29 +356,62 @@ class ColumnsManagement(StandardizeColnames):
             Schéma de la table SQL sous forme de dataframe. Contient la description des colonnes.
         logger : logging.Logger
             Fichier de log.
+        df : pd.DataFrame, optional
+            Données du csv déjà lues (ex : un bloc de lignes), le fichier est lu si None, None by default.
+        verbose : bool, optional
+            True pour signaler les colonnes manquantes ou en trop, by default True.
         """
         self.csv_file = csv_file
         self.logger = logger
-        self.df = ReadCsvWithDelimiter(csv_file, logger).read_csv_files()
+        self.verbose = verbose
+        self.df = ReadCsvWithDelimiter(csv_file, logger).read_csv_files() if df is None else df
         super().__init__(self.df, logger)
         self.schema_df = schema_df
-
-        self.type_mapping = {
-            "INTEGER": "int",
-            "BIGINT": "int",
-            "FLOAT": "float",
-            "DOUBLE": "float",
-            "REAL": "float",
-            "TEXT": "string",
-            "VARCHAR": "string",
-            "BOOLEAN": "bool",
-            "DATE": "datetime64",
-            "TIMESTAMP": "datetime64",
-        }
+        self.type_mapping = TYPE_MAPPING
 
         # Exécute la pipeline
         self.df = self.csv_pipeline()
 
+    @classmethod
+    def read_chunks(cls, csv_file: Path, schema_df: pd.DataFrame, logger: Logger, block_size: int = CSV_BLOCK_SIZE) -> Iterator[pd.DataFrame]:
+        """
+        Lit le csv par blocs avec le lecteur csv d'Arrow (multi-thread) et applique la pipeline à chaque bloc :
+        la mémoire utilisée ne dépend pas de la taille du fichier.
+        Toutes les colonnes sont lues en texte, avec les mêmes valeurs vides que pandas (NA_VALUES).
+        Seul le délimiteur détecté est essayé : une erreur de lecture est remontée, sans les lectures alternatives de read_csv_files.
+
+        Parameters
+        ----------
+        csv_file : Path
+            Fichier csv à importer.
+        schema_df : pd.DataFrame
+            Schéma de la table SQL sous forme de dataframe.
+        logger : logging.Logger
+            Fichier de log.
+        block_size : int, optional
+            Taille des blocs lus (en octets), by default CSV_BLOCK_SIZE.
+
+        Yields
+        ------
+        pd.DataFrame
+            Bloc de lignes transformé.
+        """
+        header = CsvHeader(csv_file, logger)
+        reader = pa_csv.open_csv(
+            csv_file,
+            read_options=pa_csv.ReadOptions(block_size=block_size),
+            parse_options=pa_csv.ParseOptions(delimiter=header.delimiter, quote_char='"'),
+            convert_options=pa_csv.ConvertOptions(
+                column_types={name: pa.string() for name in header.read_header()},
+                null_values=NA_VALUES,
+                strings_can_be_null=True
+            )
+        )
+        with reader:
+            for i, batch in enumerate(reader):
+                # Les colonnes manquantes ou en trop ne sont signalées que pour le premier bloc
+                yield cls(csv_file, schema_df.copy(), logger, df=batch.to_pandas(), verbose=(i == 0)).df
+
     def check_missing_columns(self):
         """
         Vérifie la cohérence entre les colonnes du fichier csv et les colonnes de la table SQL.
@@ -297,12 +424,14 @@ class ColumnsManagement(StandardizeColnames):
         extra_columns = set(csv_columns) - set(table_columns)
 
         if missing_columns:
-            self.logger.warning(f"Colonnes manquantes dans {csv_file_name} : {missing_columns}")
+            if self.verbose:
+                self.logger.warning(f"Colonnes manquantes dans {csv_file_name} : {missing_columns}")
             for col in missing_columns:
                 self.df[col] = None
 
         if extra_columns:
-            self.logger.warning(f"Colonnes en trop dans {csv_file_name} : {extra_columns}")
+            if self.verbose:
+                self.logger.warning(f"Colonnes en trop dans {csv_file_name} : {extra_columns}")
             self.df = self.df[table_columns]
 
     def get_column_length(self):
@@ -318,41 +447,6 @@ class ColumnsManagement(StandardizeColnames):
             .astype("Int64")
         )
 
-    def resolve_duplicate_columns(self):
-        """
-        Modifie les noms de colonnes en cas de doublon dans le DataFrame
-        en ajoutant un suffixe numérique (ex: 'col', 'col_1', 'col_2', ...),
-        tout en respectant la limite de 63 caractères pour les noms de colonnes.
-        """
-        MAX_LENGTH = 63
-        new_columns = []
-        seen = {}
-
-        for col in self.df.columns:
-            base_col = col
-            count = seen.get(col, 0)
-
-            if count == 0 and col not in new_columns:
-                seen[col] = 1
-                new_columns.append(col)
-            else:
-                # Génère un nom unique avec suffixe, en tenant compte de la longueur
-                while True:
-                    suffix = f"_{seen.get(base_col, 1)}"
-                    max_base_len = MAX_LENGTH - len(suffix)
-                    truncated_base = base_col[:max_base_len]
-                    new_col = f"{truncated_base}{suffix}"
-
-                    if new_col not in seen and new_col not in new_columns:
-                        break
-                    seen[base_col] = seen.get(base_col, 1) + 1
-
-                seen[new_col] = 1
-                seen[base_col] = seen.get(base_col, 1) + 1
-                new_columns.append(new_col)
-
-        self.df.columns = new_columns
-
     def convert_columns_type(self):
         """
         Convertie les colonnes du dataframe selon le type dans les tables SQL.
@@ -394,9 +488,22 @@ class ColumnsManagement(StandardizeColnames):
 
         return self.df
 
+    @property
+    def arrow_table(self) -> pa.Table:
+        """
+        Table Arrow issue du dataframe transformé.
+        DuckDB lit une table Arrow sans repasser par la conversion des colonnes 'object' de pandas.
+
+        Returns
+        -------
+        pa.Table
+            Table Arrow du csv transformé.
+        """
+        return pa.Table.from_pandas(self.df, preserve_index=False)
+
 
 class TableInCsv:
-    def __init__(self, conn, table_name: str, csv_name: str, df_fetch_func: Callable[[str], pd.DataFrame], folder: str, logger: Logger):
+    def __init__(self, conn, table_name: str, csv_name: str, csv_write_func: Callable[[Any, str, str], None], folder: str, logger: Logger):
         """
         Importe ou exporte une table au format csv depuis/vers une base de données.
 
@@ -408,8 +515,9 @@ class TableInCsv:
             Nom de la table SQL
         csv_name : str
             Nom du fichier csv en issue.
-        df_fetch_func : Callable[[str], pd.DataFrame]
-            Fonction de requêtage de la table. Une fonction existe pour duckdb et une autre pour postegres.
+        csv_write_func : Callable[[Any, str, str], None]
+            Fonction d'écriture de la table dans un fichier csv, appelée avec (conn, table_name, chemin du csv).
+            Une fonction existe pour duckdb et une autre pour postegres.
         folder : str
             Répertoire du fichier.
         logger : logging.Logger
@@ -418,14 +526,32 @@ class TableInCsv:
         self.conn = conn
         self.table_name = table_name
         self.csv_name = csv_name
-        self.df_fetch_func = df_fetch_func
+        self.csv_write_func = csv_write_func
         self.folder = folder
         self.logger = logger
 
+    @staticmethod
+    def write_dataframes(path: str, result: pd.DataFrame | Iterable[pd.DataFrame]):
+        """
+        Écrit un dataframe, ou un itérable de dataframes, dans un fichier csv (séparateur ';', encodage utf-8-sig).
+        Les blocs d'un itérable sont écrits au fil de l'eau sans charger toute la table en mémoire.
+
+        Parameters
+        ----------
+        path : str
+            Chemin du fichier csv.
+        result : pd.DataFrame | Iterable[pd.DataFrame]
+            Données de la table.
+        """
+        chunks = [result] if isinstance(result, pd.DataFrame) else result
+        with open(path, "w", encoding="utf-8-sig", newline="") as f:
+            for i, df in enumerate(chunks):
+                df.to_csv(f, index=False, sep=";", header=(i == 0))
+
     def import_to_csv(self):
         """
         Importe une table SQL vers un format csv.
-        Le dataframe peut être issue d'un requêtage duckdb ou postgres.
+        La table peut être issue d'une base duckdb ou postgres.
         """
         input_folder = self.folder
         os.makedirs(input_folder, exist_ok=True)
@@ -437,8 +563,7 @@ class TableInCsv:
 
         try:
             # Importation
-            df = self.df_fetch_func(self.conn, self.table_name)
-            df.to_csv(input_path, index=False, sep=";", encoding="utf-8-sig")
+            self.csv_write_func(self.conn, self.table_name, input_path)
             self.logger.info(f"✅ Import réussi : {file_name}")
         except Exception as e:
             self.logger.error(f"❌ Erreur d'import pour '{self.table_name}' → {e}")
@@ -446,7 +571,7 @@ class TableInCsv:
     def export_to_csv(self, date: str):
         """
         Exporte une table SQL vers un format csv.
-        Le dataframe peut être issue d'un requêtage duckdb ou postgres.
+        La table peut être issue d'une base duckdb ou postgres.
 
         date : str
             Date présente dans le nom des fichiers à exporter.
@@ -462,9 +587,7 @@ class TableInCsv:
         os.makedirs(os.path.dirname(output_path), exist_ok=True)
         try:
             # Exportation
-            df = self.df_fetch_func(self.conn, self.table_name)
-            
-            df.to_csv(output_path, index=False, sep=";", encoding="utf-8-sig")
+            self.csv_write_func(self.conn, self.table_name, output_path)
             self.logger.info(f"✅ Export réussi : {file_name}")
         except Exception as e:
             self.logger.error(f"❌ Erreur d'export pour '{self.table_name}' → {e}")
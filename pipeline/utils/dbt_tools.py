@@ -1,30 +1,171 @@
 # === Packages ===
-import os
+import hashlib
+import functools
+import logging
 from pathlib import Path
-import subprocess
 from typing import Literal
 from logging import Logger
 
 # === Modules ===
 from pipeline.utils.config import env_var, setup_config
+from pipeline.utils.load_yml import read_yaml_file
+
+# === Constantes ===
+# Niveaux des évènements dbt transmis à la log
+DBT_LOG_LEVELS = {"info": logging.INFO, "warn": logging.WARNING, "error": logging.ERROR}
 
 # === Fonctions ===
-def dbt_deps(project_path: str):
-    return subprocess.run(
-        ["dbt",
-         "deps",
-         "--project-dir", project_path
-        ])
-
-def dbt_exec(type_exec: str, profile: str, target: Literal["local", "anais"], project_dir: str, profiles_dir: str, logger: Logger, install_deps: bool = True):
+@functools.lru_cache(maxsize=32)
+def resolve_path(path: str) -> str:
+    """ Chemin absolu d'un répertoire, résolu une seule fois par chemin. """
+    return str(Path(path).resolve())
+
+
+@functools.lru_cache(maxsize=None)
+def get_dbt_runner(logger: Logger):
     """
-    Fonction exécutant la commande 'dbt test' avec les différentes options.
+    Exécuteur dbt dans le processus Python courant (dbtRunner), créé une seule fois par log.
+    Les évènements dbt (hors debug) sont transmis à la log au fil de l'exécution.
+
+    Parameters
+    ----------
+    logger : Logger
+        Fichier de log.
+
+    Returns
+    -------
+    dbt.cli.main.dbtRunner
+        Exécuteur dbt.
+    """
+    # Import de dbt (long) seulement au premier lancement d'une commande dbt
+    from dbt.cli.main import dbtRunner
+
+    def log_event(event):
+        level = event.info.level
+        if level in DBT_LOG_LEVELS:
+            logger.log(DBT_LOG_LEVELS[level], event.info.msg)
+
+    return dbtRunner(callbacks=[log_event])
+
+
+def invoke_dbt(args: list, logger: Logger):
+    """
+    Lance une commande dbt dans le processus courant, puis libère la base DuckDB éventuellement ouverte par dbt.
+
+    Parameters
+    ----------
+    args : list
+        Arguments de la commande dbt, ex : ["build", "--project-dir", "."].
+    logger : Logger
+        Fichier de log.
+
+    Returns
+    -------
+    dbt.cli.main.dbtRunnerResult
+        Résultat de la commande (success, exception, result).
+    """
+    try:
+        return get_dbt_runner(logger).invoke(args)
+    finally:
+        release_dbt_duckdb(logger)
+
+
+def release_dbt_duckdb(logger: Logger):
+    """
+    Ferme la connexion DuckDB gardée par dbt-duckdb après une commande dbt exécutée dans le processus courant.
+    Sans cela, la base reste ouverte avec la configuration de dbt, et DuckDB refuse ensuite
+    de l'ouvrir avec une autre configuration dans le même processus (ex : connexion en lecture seule pour les exports).
+    Un échec de la libération est seulement journalisé, pour ne pas masquer le résultat de la commande dbt.
+
+    Parameters
+    ----------
+    logger : Logger
+        Fichier de log.
+    """
+    try:
+        from dbt.adapters.duckdb.connections import DuckDBConnectionManager
+    except ImportError:
+        # dbt-duckdb non installé : aucune base DuckDB n'a pu être ouverte par dbt
+        return
+
+    try:
+        environment = getattr(DuckDBConnectionManager, "_ENV", None)
+        if environment is not None and getattr(environment, "conn", None) is not None:
+            environment.conn.close()
+            environment.conn = None
+        DuckDBConnectionManager.close_all_connections()
+    except Exception as e:
+        logger.warning(f"⚠️ Impossible de libérer la base DuckDB ouverte par dbt : {e}")
+
+
+def dbt_deps(project_path: str, logger: Logger):
+    """
+    Fonction exécutant la commande 'dbt deps' (installation des packages dbt du projet).
+
+    Parameters
+    ----------
+    project_path : str
+        Répertoire du projet dbt (contenant le 'dbt_project.yml').
+    logger : Logger
+        Fichier de log.
+
+    Returns
+    -------
+    dbt.cli.main.dbtRunnerResult
+        Résultat de la commande (success, exception, result).
+    """
+    return invoke_dbt(["deps", "--project-dir", project_path], logger)
+
+
+def install_dbt_deps(project_path: str, logger: Logger):
+    """
+    Installe les packages dbt du projet ('dbt deps') seulement si le fichier des packages ('packages.yml' ou 'dependencies.yml')
+    a changé depuis la dernière installation, ou si le répertoire des packages ('packages-install-path' du 'dbt_project.yml',
+    'dbt_packages' par défaut) est absent.
+    Une installation réussie est mémorisée par un fichier marqueur 'target/.deps-<empreinte du fichier des packages>.ok'.
+
+    Parameters
+    ----------
+    project_path : str
+        Répertoire du projet dbt (contenant le 'dbt_project.yml').
+    logger : Logger
+        Fichier de log.
+    """
+    packages_file = next(
+        (Path(project_path) / name for name in ("packages.yml", "dependencies.yml") if (Path(project_path) / name).is_file()),
+        None
+    )
+    if packages_file is None:
+        return
+
+    packages_hash = hashlib.blake2b(packages_file.read_bytes(), digest_size=8).hexdigest()
+    marker = Path(project_path) / "target" / f".deps-{packages_hash}.ok"
+    project_file = Path(project_path) / "dbt_project.yml"
+    project_config = read_yaml_file(str(project_file)) if project_file.is_file() else None
+    install_path = Path(project_path) / ((project_config or {}).get("packages-install-path") or "dbt_packages")
+    if marker.is_file():
+        if install_path.is_dir():
+            return
+        # Marqueur d'une installation supprimée depuis (dbt clean, nouveau clone...) : les packages sont réinstallés
+        marker.unlink()
+
+    dbt_deps_run = dbt_deps(project_path, logger)
+    if dbt_deps_run.success:
+        marker.parent.mkdir(parents=True, exist_ok=True)
+        marker.touch()
+    else:
+        logger.error("❌ Erreur lors de l'installation des packages dbt (dbt deps)")
+
+
+def dbt_exec(type_exec: str, profile: str, target: Literal["local", "anais"], project_dir: str, profiles_dir: str, logger: Logger, install_deps: bool = True) -> bool:
+    """
+    Fonction exécutant une commande dbt (run, test, build...) avec les différentes options.
     Exécute obligatoirement le répertoire 'base' dans les modèles dbt, ainsi que le répertoire choisi.
 
     Parameters
     ----------
     type_exec : str
-        Type d'exécution dbt (run, test, compile)
+        Type d'exécution dbt (run, test, build, compile)
     profile : str
         Profile dbt à utiliser parmis ceux dans 'profiles.yml'.
     target : Literal["local", "anais"]
@@ -35,37 +176,40 @@ def dbt_exec(type_exec: str, profile: str, target: Literal["local", "anais"], pr
         Répertoire du projet dbt (contenant le 'profiles.yml').
     logger : Logger
         Fichier de log.
+
+    Returns
+    -------
+    bool
+        True si la commande dbt a réussi.
     """
-    try:
-        project_path = str(Path(project_dir).resolve())
-        profiles_path = str(Path(profiles_dir).resolve())
-
-        if not os.path.exists(os.path.join(project_path, "package-lock.yml")) and install_deps:
-            dbt_deps_install = dbt_deps(project_path)
-
-        result = subprocess.run(
-            ["dbt",
-             type_exec,
-             "--project-dir", project_path,
-             "--profiles-dir", profiles_path,
-             "--profile", profile,
-             "--target", target,
-             "--select", f"+{project_dir}"
-             ],
-            capture_output=True,
-            text=True,
-            check=True
-        )
-        logger.info(f"✅ Dbt {type_exec} de {project_dir} terminé avec succès")
-        logger.info(result.stdout)
-
-    except subprocess.CalledProcessError as e:
-        logger.error(f"❌ Erreur lors du dbt {type_exec} :")
-        logger.error(e.stdout)
+    project_path = resolve_path(project_dir)
+    profiles_path = resolve_path(profiles_dir)
+
+    if install_deps:
+        install_dbt_deps(project_path, logger)
+
+    # Exécution dans le processus courant : la sortie de dbt est transmise à la log pendant l'exécution
+    result = invoke_dbt(
+        [type_exec,
+         "--project-dir", project_path,
+         "--profiles-dir", profiles_path,
+         "--profile", profile,
+         "--target", target,
+         "--select", f"+{project_dir}"
+         ],
+        logger
+    )
+    if not result.success:
+        detail = f" : {result.exception}" if result.exception else ", voir la sortie dbt ci-dessus"
+        logger.error(f"❌ Erreur lors du dbt {type_exec}{detail}")
+        return False
+
+    logger.info(f"✅ Dbt {type_exec} de {project_dir} terminé avec succès")
+    return True
+
 
 if __name__ == "__main__":
     config_var = env_var() 
     config_var = setup_config(config_var)
 
-    dbt_exec("run", config_var["profile"], config_var["env"], config_var["config"]["models_directory"], ".", config_var["logger"])
-    dbt_exec("test", config_var["profile"], config_var["env"], config_var["config"]["models_directory"], ".", config_var["logger"])
\ No newline at end of file
+    dbt_exec("build", config_var["profile"], config_var["env"], config_var["config"]["models_directory"], ".", config_var["logger"])
\ No newline at end of file
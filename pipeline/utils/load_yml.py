@@ -1,12 +1,39 @@
 # === Packages ===
 import os
+import copy
+import functools
 from pathlib import Path
 import yaml
 import re
 from logging import Logger
 
 
+# === Constantes ===
+# Parseur YAML de libyaml (C) s'il est disponible, parseur Python sinon
+YAML_LOADER = getattr(yaml, "CSafeLoader", yaml.SafeLoader)
+
+
 # === Fonctions ===
+@functools.lru_cache(maxsize=16)
+def read_yaml_file(path: str) -> dict:
+    """
+    Lit et parse un fichier YAML, une seule fois par chemin : les lectures suivantes réutilisent le résultat.
+    Le résultat est partagé entre les appels, il ne doit pas être modifié (voir load_YAML).
+
+    Parameters
+    ----------
+    path : str
+        Chemin du fichier YAML.
+
+    Returns
+    -------
+    dict
+        Contenu du fichier.
+    """
+    with open(path, 'rb') as f:
+        return yaml.load(f, Loader=YAML_LOADER)
+
+
 def load_YAML(file_name: str, config_file_dir: str, logger: Logger) -> dict:
     """
     Charge un fichier YAML.
@@ -40,10 +67,10 @@ def load_YAML(file_name: str, config_file_dir: str, logger: Logger) -> dict:
         current_dir = Path(__file__).resolve().parent
         path = current_dir.parent / "pipeline" / file_name
     try:
-        with open(path, 'r') as f:
-            file = yaml.safe_load(f)
-            logger.info(f"Acces config file readed from {path}")
-            return file
+        # Copie du fichier déjà parsé, pour que l'appelant puisse la modifier sans effet sur les autres lectures
+        file = copy.deepcopy(read_yaml_file(str(path)))
+        logger.info(f"Acces config file readed from {path}")
+        return file
 
     except FileNotFoundError:
         logger.error(f"Fichier de configuration introuvable {path}")
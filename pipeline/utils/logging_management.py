@@ -1,6 +1,9 @@
 # === Packages ===
 import os
+import atexit
+import queue
 import logging
+from logging.handlers import QueueHandler, QueueListener
 
 
 # === Fonctions ===
@@ -31,6 +34,13 @@ def setup_logger(name: str, log_file: str, level=logging.INFO) -> logging.Logger
         file_handler = logging.FileHandler(log_file)
         formatter = logging.Formatter("%(asctime)s - %(levelname)s - %(message)s")
         file_handler.setFormatter(formatter)
-        logger.addHandler(file_handler)
+
+        # Les messages sont déposés dans une file : l'écriture sur disque est faite par un thread dédié,
+        # sans bloquer la pipeline (chargements parallèles notamment)
+        log_queue = queue.Queue(-1)
+        listener = QueueListener(log_queue, file_handler, respect_handler_level=True)
+        listener.start()
+        atexit.register(listener.stop)  # Vide la file avant la fin du programme
+        logger.addHandler(QueueHandler(log_queue))
 
     return logger
@@ -2,6 +2,8 @@
 import os
 from paramiko import SFTPClient, Transport, SFTPAttributes
 import datetime
+import threading
+from concurrent.futures import ThreadPoolExecutor
 from dotenv import load_dotenv
 from typing import Optional, List, Dict
 from logging import Logger
@@ -10,6 +12,13 @@ from logging import Logger
 from pipeline.utils.csv_management import TransformExcel
 from pipeline.utils.config import env_var, setup_config
 
+# === Constantes ===
+# Nombre maximal de transferts simultanés, chacun sur son propre canal SFTP d'une même connexion SSH
+SFTP_MAX_WORKERS = 8
+# Fenêtre SSH de chaque canal (octets envoyés sans attendre d'acquittement), 2 Mo par défaut dans paramiko
+SFTP_WINDOW_SIZE = 16 * 1024 * 1024
+
+
 # === Classes ===
 # Classe SFTPSync
 class SFTPSync:
@@ -31,20 +40,36 @@ class SFTPSync:
         self.port = int(os.getenv("SFTP_PORT"))
         self.username = os.getenv("SFTP_USERNAME")
         self.password = os.getenv("SFTP_PASSWORD")
+        self.channels = threading.local()
+        self.clients = []
+        self.clients_lock = threading.Lock()
 
     def connect(self):
         """
         Initialisation de la connexion SFTP.
         """
         try:
-            self.transport = Transport((self.host, self.port))
+            self.transport = Transport((self.host, self.port), default_window_size=SFTP_WINDOW_SIZE)
             self.transport.connect(username=self.username, password=self.password)
-            self.sftp = SFTPClient.from_transport(self.transport)
             self.logger.info("Connexion SFTP établie.")
         except Exception as e:
             self.logger.error(f"Erreur de connexion SFTP : {e}")
             raise
 
+    @property
+    def sftp(self) -> SFTPClient:
+        """
+        Client SFTP du thread courant : chaque thread ouvre son propre canal sur la connexion SSH partagée,
+        ce qui permet plusieurs transferts simultanés sans nouvelle authentification.
+        """
+        client = getattr(self.channels, "client", None)
+        if client is None:
+            client = SFTPClient.from_transport(self.transport)
+            self.channels.client = client
+            with self.clients_lock:
+                self.clients.append(client)
+        return client
+
     def sftp_dir_exists(self, path: str) -> bool:
         """
         Vérifie l'existence d'un répertoire SFTP.
@@ -117,10 +142,42 @@ class SFTPSync:
         except Exception as e:
             self.logger.error(f"Échec du téléchargement {remote_dir} : {e}")
 
+    def download_one(self, item: Dict[str, str]):
+        """
+        Téléchargement depuis le SFTP de la dernière version d'un fichier, enregistrée au format csv en local.
+
+        Parameters
+        ----------
+        item : Dict[str, str]
+            Fichier à télécharger contenant :
+             - path : répertoire dans lequel trouver le fichier
+             - keyword : chaine de caractère à trouver dans le nom du fichier
+             - file : nom du fichier csv en sortie
+        """
+        remote_dir, keyword, local_filename = item["path"], item["keyword"], item["file"]
+        self.logger.info(f"Recherche du fichier contenant '{keyword}' dans {remote_dir}")
+        latest_file = self.get_latest_file(remote_dir, keyword)
+
+        if latest_file:
+            remote_path = os.path.join(remote_dir, latest_file.filename)
+            mod_time = datetime.datetime.fromtimestamp(latest_file.st_mtime)
+            local_path = os.path.join(self.output_folder, local_filename)
+            self.logger.info(f"Dernière version : {latest_file.filename} (modifié le {mod_time})")
+
+            # Gestion des fichiers au format excel (DIAMANT)
+            if '.xlsx' in latest_file.filename:
+                local_xlsx_path = local_path.replace('.csv', '.xlsx')
+                self.download_file(remote_path, local_xlsx_path)
+                TransformExcel(local_xlsx_path, local_path, logger=self.logger)
+            # Autres fichiers au format csv
+            else:
+                self.download_file(remote_path, local_path)
+
     def download_all(self, files_list: List[Dict[str, str]]):
         """
         Téléchargement de tous les fichiers indiqués dans files_list, depuis le SFTP.
         Les fichiers sont enregistrés sous format csv dans un fichier local.
+        Les téléchargements sont répartis entre SFTP_MAX_WORKERS threads (download_one).
 
         Parameters
         ----------
@@ -131,31 +188,33 @@ class SFTPSync:
              - file : nom du fichier csv en sortie
         """
         self.connect()
-        files_to_download = [
-            (item["path"], item["keyword"], item["file"])
-            for item in files_list
-        ]
-
-        # Boucle parcourant chaque fichier à télécharger
-        for remote_dir, keyword, local_filename in files_to_download:
-            self.logger.info(f"Recherche du fichier contenant '{keyword}' dans {remote_dir}")
-            latest_file = self.get_latest_file(remote_dir, keyword)
-
-            if latest_file:
-                remote_path = os.path.join(remote_dir, latest_file.filename)
-                mod_time = datetime.datetime.fromtimestamp(latest_file.st_mtime)
-                local_path = os.path.join(self.output_folder, local_filename)
-                self.logger.info(f"Dernière version : {latest_file.filename} (modifié le {mod_time})")
-
-                # Gestion des fichiers au format excel (DIAMANT)
-                if '.xlsx' in latest_file.filename:
-                    local_xlsx_path = local_path.replace('.csv', '.xlsx')
-                    self.download_file(remote_path, local_xlsx_path)
-                    TransformExcel(local_xlsx_path, local_path, logger=self.logger)
-                # Autres fichiers au format csv
-                else:
-                    self.download_file(remote_path, local_path)
-        self.close()
+        try:
+            with ThreadPoolExecutor(max_workers=SFTP_MAX_WORKERS) as executor:
+                list(executor.map(self.download_one, files_list))
+        finally:
+            self.close()
+
+    def upload_one(self, local_path: str, remote_path: str):
+        """
+        Upload d'un fichier local vers le SFTP.
+
+        Parameters
+        ----------
+        local_path : str
+            Chemin du fichier csv local.
+        remote_path : str
+            Chemin du fichier sur le SFTP.
+        """
+        file_name = os.path.basename(local_path)
+        # Vérifie l'existence du fichier csv dans output
+        if os.path.exists(local_path):
+            try:
+                self.sftp.put(local_path, remote_path)
+                self.logger.info(f"✅ Upload réussi: {file_name} → {remote_path}")
+            except Exception as e:
+                self.logger.error(f"❌ Échec de l'upload {file_name} → {e}")
+        else:
+            self.logger.warning(f"⚠️ Fichier introuvable : {local_path}")
 
     def upload_file_to_sftp(self, views_to_export: dict, output_dir: str, remote_dir: str, date: str):
         """
@@ -173,30 +232,29 @@ class SFTPSync:
             Date présente dans le nom des fichiers à exporter.
         """
         self.connect()
-        if remote_dir:
-            if not self.sftp_dir_exists(remote_dir):
-                self.logger.error(f"❌ Répertoire SFTP inexistant : {remote_dir}")
-            else:
-                for _, csv_name in views_to_export.items():
-                    # Récupère le nom du fichier csv
-                    file_name = f'{csv_name}_{date}.csv'
-                    local_path = os.path.join(output_dir, file_name)
-                    remote_path = os.path.join(remote_dir, file_name)
-
-                    # Vérifie l'existence du fichier csv dans output
-                    if os.path.exists(local_path):
-                        try:
-                            self.sftp.put(local_path, remote_path)
-                            self.logger.info(f"✅ Upload réussi: {file_name} → {remote_path}")
-                        except Exception as e:
-                            self.logger.error(f"❌ Échec de l'upload {file_name} → {e}")
-                    else:
-                        self.logger.warning(f"⚠️ Fichier introuvable : {local_path}")
-        self.close()
+        try:
+            if remote_dir:
+                if not self.sftp_dir_exists(remote_dir):
+                    self.logger.error(f"❌ Répertoire SFTP inexistant : {remote_dir}")
+                else:
+                    # Récupère le nom des fichiers csv
+                    file_names = [f'{csv_name}_{date}.csv' for csv_name in views_to_export.values()]
+                    with ThreadPoolExecutor(max_workers=SFTP_MAX_WORKERS) as executor:
+                        list(executor.map(
+                            self.upload_one,
+                            [os.path.join(output_dir, file_name) for file_name in file_names],
+                            [os.path.join(remote_dir, file_name) for file_name in file_names]
+                            ))
+        finally:
+            self.close()
 
     def close(self):
-        """ Fermeture de la connexion SFTP """
-        self.sftp.close()
+        """ Fermeture de la connexion SFTP (canaux de tous les threads, puis connexion SSH) """
+        with self.clients_lock:
+            for client in self.clients:
+                client.close()
+            self.clients = []
+        self.channels = threading.local()
         self.transport.close()
         self.logger.info("Connexion SFTP fermée.")
 
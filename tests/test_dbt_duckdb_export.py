@@ -0,0 +1,56 @@
+# === Packages ===
+import logging
+import pytest
+
+# === Modules ===
+pytest.importorskip("dbt.adapters.duckdb")
+from pipeline.database_management.duckdb_pipeline import DuckDBPipeline
+from pipeline.utils.dbt_tools import dbt_exec
+
+
+# === Constantes ===
+DBT_PROJECT = """
+name: smoke
+version: "1.0.0"
+profile: Smoke
+model-paths: ["models"]
+"""
+PROFILES = """
+Smoke:
+  target: local
+  outputs:
+    local:
+      type: duckdb
+      path: smoke.duckdb
+      threads: 1
+"""
+VIEW = "SELECT true AS flag, '' AS label, 1 AS value"
+
+
+# === Tests ===
+def test_build_then_export(tmp_path, monkeypatch):
+    """ Un 'dbt build' exécuté dans le processus laisse la base DuckDB disponible pour l'export en lecture seule. """
+    monkeypatch.chdir(tmp_path)
+    monkeypatch.setenv("DBT_SEND_ANONYMOUS_USAGE_STATS", "false")
+    (tmp_path / "dbt_project.yml").write_text(DBT_PROJECT)
+    (tmp_path / "profiles.yml").write_text(PROFILES)
+    (tmp_path / "models").mkdir()
+    (tmp_path / "models" / "smoke_view.sql").write_text(VIEW)
+    logger = logging.getLogger("smoke")
+
+    assert dbt_exec("build", "Smoke", "local", ".", ".", logger)
+
+    config = {
+        "local_directory_input": "input",
+        "local_directory_output": "output",
+        "create_table_directory": "sql",
+    }
+    loader = DuckDBPipeline({"path": "smoke.duckdb", "type": "duckdb"}, config, logger)
+    loader.connect(read_only=True)
+    try:
+        loader.export_csv({"smoke_view": "smoke"}, date="2024_01_01")
+    finally:
+        loader.close()
+
+    exported = (tmp_path / "output" / "smoke_2024_01_01.csv").read_text(encoding="utf-8-sig")
+    assert exported.splitlines() == ["flag;label;value", "True;;1"]
@@ -0,0 +1,32 @@
+# === Packages ===
+import logging
+
+# === Modules ===
+from pipeline.database_management.duckdb_pipeline import DuckDBPipeline
+
+
+# === Constantes ===
+CONFIG = {
+    "local_directory_input": "input",
+    "local_directory_output": "output",
+    "create_table_directory": "sql",
+}
+
+
+# === Tests ===
+def test_reset_histo_with_and_without_views(tmp_path, monkeypatch):
+    """ reset_histo supprime les tables z*, qu'elles aient ou non des vues dépendantes. """
+    monkeypatch.chdir(tmp_path)
+    pipeline = DuckDBPipeline({"path": "histo.duckdb", "type": "duckdb", "schema": "main"}, CONFIG, logging.getLogger("histo"))
+    pipeline.connect()
+    pipeline.conn.execute("""
+        CREATE TABLE zt_with_view AS SELECT 1 AS a;
+        CREATE TABLE zt_without_view AS SELECT 1 AS a;
+        CREATE VIEW v_histo AS SELECT * FROM zt_with_view;
+        CREATE TABLE kept AS SELECT 1 AS a;
+    """)
+
+    pipeline.reset_histo()
+
+    remaining = pipeline.conn.execute("SELECT table_name FROM information_schema.tables ORDER BY table_name").fetchall()
+    assert remaining == [("kept",)]
@@ -0,0 +1,72 @@
+# === Packages ===
+import logging
+import threading
+import pandas as pd
+import pytest
+from contextlib import nullcontext
+from sqlalchemy import create_engine, event, text
+
+# === Modules ===
+from pipeline.database_management import postgres_loader
+from pipeline.database_management.postgres_loader import PostgreSQLLoader
+
+
+# === Fixtures ===
+@pytest.fixture
+def engine(tmp_path):
+    """ Base SQLite dont les créations de tables sont transactionnelles, comme sous postgres. """
+    engine = create_engine(f"sqlite:///{tmp_path / 'load.db'}")
+
+    @event.listens_for(engine, "connect")
+    def disable_implicit_transactions(dbapi_connection, connection_record):
+        dbapi_connection.isolation_level = None
+
+    @event.listens_for(engine, "begin")
+    def begin(conn):
+        conn.exec_driver_sql("BEGIN")
+
+    yield engine
+    engine.dispose()
+
+
+@pytest.fixture
+def loader(monkeypatch):
+    """ Loader postgres sans base : seules les étapes de transaction de load_csv_file sont exécutées. """
+    loader = PostgreSQLLoader.__new__(PostgreSQLLoader)
+    loader.logger = logging.getLogger("load_csv")
+    loader.schema = "main"
+    loader.metadata_lock = threading.RLock()
+    monkeypatch.setattr(loader, "is_table_exist", lambda conn, query_params: True)
+    monkeypatch.setattr(loader, "get_postgres_schema", lambda conn, table_name: pd.DataFrame({"column_name": ["a"], "column_type": ["INTEGER"]}))
+    monkeypatch.setattr(loader, "bulk_load", lambda conn, table_name: nullcontext())
+    monkeypatch.setattr(loader, "copy_dataframe", lambda conn, table_name, df: conn.execute(
+        text(f"INSERT INTO {table_name} (a) VALUES (:a)"), df.to_dict("records")))
+    monkeypatch.setattr(postgres_loader.ColumnsManagement, "read_chunks", lambda csv_file, schema_df, logger: iter([pd.DataFrame({"a": [1, 2]})]))
+    return loader
+
+
+def abandon_native(conn, csv_file, table_name, schema_df):
+    """ Lecture par COPY abandonnée (ex : délimiteur multi-octets '¤'). """
+    return False
+
+
+def fail_native(conn, csv_file, table_name, schema_df):
+    """ Lecture par COPY en erreur (ex : conversion impossible). """
+    raise ValueError("conversion impossible")
+
+
+# === Tests ===
+@pytest.mark.parametrize("native", [abandon_native, fail_native])
+def test_fallback_keeps_created_table(engine, loader, monkeypatch, tmp_path, native):
+    """ L'abandon de la lecture par COPY ne doit pas annuler la création de la table (create_tables non validé). """
+    monkeypatch.setattr(loader, "load_csv_native", native)
+    csv_file = tmp_path / "t.csv"
+    csv_file.write_text("a\n1\n2\n")
+
+    with engine.connect() as conn:
+        # Table créée par create_tables, dans une transaction encore ouverte
+        conn.execute(text("CREATE TABLE t (a INTEGER)"))
+        loader.load_csv_file(conn, csv_file)
+
+    with engine.connect() as check:
+        assert check.execute(text("SELECT a FROM t ORDER BY a")).scalars().all() == [1, 2]